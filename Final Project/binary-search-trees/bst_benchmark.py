@@ -0,0 +1,223 @@
+# Benchmarks for the Binary Search Tree classes in bst_solution.py
+
+"""
+This program will time how long it takes to build trees from sorted keys.
+
+Sorted keys are the worst case for the plain BST: every new key goes to
+the right of the last one, so the tree turns into a linked chain.  Each
+insert has to walk the whole chain, so building it costs O(n^2).  The
+BalancedBST rotates as it goes, so it stays O(log n) tall and can take
+the full 1,000,000 keys.
+
+It also times create_bst_from_sorted_list, which links the nodes of a
+balanced tree together directly in one O(n) pass, and compares the memory
+and lookup speed of the pointer-based BST with the array-backed CompactBST.
+
+It also compares building a MultisetBST from unsorted values with
+duplicates one insert at a time against build_multiset, which counts
+and sorts chunks of them in several processes.
+
+Finally, it measures how many lookups reader threads get through while a
+writer thread keeps inserting, first with a BalancedBST behind one shared
+lock and then with lock-free snapshots of a PersistentBST.
+
+Run it from this folder:
+
+    python bst_benchmark.py
+
+"""
+import random
+import threading
+import time
+import tracemalloc
+
+if __package__:
+    from .bst_compact import CompactBST
+    from .bst_multiset import MultisetBST, build_multiset
+    from .bst_persistent import PersistentBST
+    from .bst_solution import BST, BalancedBST, create_bst_from_sorted_list
+else:
+    from bst_compact import CompactBST
+    from bst_multiset import MultisetBST, build_multiset
+    from bst_persistent import PersistentBST
+    from bst_solution import BST, BalancedBST, create_bst_from_sorted_list
+
+
+def time_sorted_inserts(tree_class, count):
+    # Insert 0..count-1 in order and return (seconds, height)
+    tree = tree_class()
+    start = time.perf_counter()
+    for key in range(count):
+        tree.insert(key)
+    return time.perf_counter() - start, tree.get_height()
+
+
+def report(name, count, seconds, height):
+    # Print one line of the results table
+    rate = count / seconds if seconds > 0 else float("inf")
+    print(f"{name:<12}{count:>10,}{seconds:>12.3f} s{height:>10}{rate:>14,.0f} /s")
+
+
+def benchmark_sorted_inserts(large=1_000_000):
+    print("\n=========== SORTED INSERTS: BST vs BalancedBST ===========")
+    print(f"{'tree':<12}{'keys':>10}{'time':>14}{'height':>10}{'inserts':>16}")
+
+    # The plain BST is O(n^2) on sorted keys, so only small sizes are tried.
+    for count in (100, 500, 900, 5_000):
+        report("BST", count, *time_sorted_inserts(BST, count))
+
+    for count in (100, 500, 900, 10_000, 100_000, large):
+        report("BalancedBST", count, *time_sorted_inserts(BalancedBST, count))
+
+
+def benchmark_bulk_load(sizes=(10_000, 100_000, 1_000_000)):
+    print("\n=========== BULK LOAD: create_bst_from_sorted_list ===========")
+    print(f"{'tree':<12}{'keys':>10}{'time':>14}{'height':>10}{'keys':>16}")
+    for count in sizes:
+        start = time.perf_counter()
+        tree = create_bst_from_sorted_list(range(count))
+        report("bulk load", count, time.perf_counter() - start, tree.get_height())
+
+
+def benchmark_multiset_build(count=1_000_000, distinct=100_000):
+    print("\n=========== MULTISET BUILD: inserts vs build_multiset ===========")
+    print(f"{'tree':<12}{'values':>10}{'time':>14}{'height':>10}{'values':>16}")
+    values = [random.randrange(distinct) for _ in range(count)]
+
+    start = time.perf_counter()
+    tree = MultisetBST()
+    for value in values:
+        tree.insert(value)
+    report("inserts", count, time.perf_counter() - start, tree.get_height())
+
+    for workers in (0, None):
+        start = time.perf_counter()
+        tree = build_multiset(values, chunk_size=count // 8, workers=workers)
+        name = "1 process" if workers == 0 else "parallel"
+        report(name, count, time.perf_counter() - start, tree.get_height())
+
+
+def measure_memory(build):
+    # Return (object, bytes allocated while calling build())
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def benchmark_compact(count=1_000_000, probes=1_000_000):
+    print("\n=========== MEMORY AND LOOKUPS: BST vs CompactBST ===========")
+    tree, tree_bytes = measure_memory(lambda: create_bst_from_sorted_list(range(count)))
+    compact, compact_bytes = measure_memory(lambda: CompactBST(range(count)))
+    print(f"BST         {tree_bytes / count:>8.1f} bytes per key")
+    print(f"CompactBST  {compact_bytes / count:>8.1f} bytes per key")
+
+    # Half of the probes are in the tree and half are not
+    queries = [random.randrange(2 * count) for _ in range(probes)]
+
+    start = time.perf_counter()
+    for key in queries:
+        tree.contains(key)
+    seconds = time.perf_counter() - start
+    print(f"BST.contains           {probes / seconds:>14,.0f} lookups/s")
+
+    start = time.perf_counter()
+    for key in queries:
+        key in compact
+    seconds = time.perf_counter() - start
+    print(f"CompactBST in          {probes / seconds:>14,.0f} lookups/s")
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("CompactBST.search_many skipped (NumPy is not installed)")
+        return
+    batch = np.array(queries, dtype=np.int64)
+    start = time.perf_counter()
+    compact.search_many(batch)
+    seconds = time.perf_counter() - start
+    print(f"CompactBST.search_many {probes / seconds:>14,.0f} lookups/s")
+
+
+def run_readers_and_writer(read, write, readers, writes):
+    """
+    Start 'readers' threads that call read() in a loop and one writer
+    thread that calls write(i) for i in range(writes).  Return the
+    number of reads done per second while the writer was running.
+    """
+    done = threading.Event()
+    counts = [0] * readers
+
+    def reader(slot):
+        count = 0
+        while not done.is_set():
+            read()
+            count += 1
+        counts[slot] = count
+
+    def writer():
+        for i in range(writes):
+            write(i)
+        done.set()
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    writer_thread.join()
+    seconds = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds, writes / seconds
+
+
+def benchmark_concurrent_readers(readers=4, writes=100_000, count=100_000):
+    print("\n=========== READERS DURING WRITES: lock vs snapshots ===========")
+    keys = list(range(0, 2 * count, 2))
+    random.shuffle(keys)
+
+    # A BalancedBST that every reader and the writer share behind one lock
+    locked = create_bst_from_sorted_list(range(0, 2 * count, 2), BalancedBST)
+    lock = threading.Lock()
+
+    def locked_read():
+        with lock:
+            for key in keys[:100]:
+                locked.contains(key)
+
+    def locked_write(i):
+        with lock:
+            locked.insert(2 * i + 1)
+
+    # A PersistentBST where readers take a snapshot and never wait
+    persistent = PersistentBST()
+    persistent.root = create_bst_from_sorted_list(range(0, 2 * count, 2)).root
+
+    def snapshot_read():
+        snapshot = persistent.snapshot()
+        for key in keys[:100]:
+            snapshot.contains(key)
+
+    def persistent_write(i):
+        persistent.insert(2 * i + 1)
+
+    for name, read, write in (("lock", locked_read, locked_write),
+                              ("snapshot", snapshot_read, persistent_write)):
+        reads, inserts = run_readers_and_writer(read, write, readers, writes)
+        print(f"{name:<10}{readers} readers {100 * reads:>14,.0f} lookups/s"
+              f"   writer {inserts:>10,.0f} inserts/s")
+
+
+def main():
+    benchmark_sorted_inserts()
+    benchmark_bulk_load()
+    benchmark_multiset_build()
+    benchmark_compact()
+    benchmark_concurrent_readers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# A frozen, array-backed Binary Search Tree
+
+"""
+Every BST.Node is a separate Python object, so a large tree costs a lot of
+memory per value and the nodes end up scattered around the heap.  Once a
+tree is finished being built it often does not need to change again.
+
+CompactBST stores the same values in one contiguous typed array (from the
+'array' module) in Eytzinger order, which is the order you would meet the
+nodes if you read the tree level by level (breadth first):
+
+    index:   1    2    3    4    5    6    7
+    value:  40   20   60   10   30   50   70
+
+The root is at index 1 and the children of the node at index i are at
+2*i (left) and 2*i + 1 (right), so no links need to be stored at all.
+Index 0 is not used.  The tree is complete, which means it has the same
+height as the one made by create_bst_from_sorted_list.
+
+The values must fit the typecode of the array ('q' for 64-bit integers,
+'d' for floats).  search_many uses NumPy, which is only imported when it
+is called.
+
+Because the whole tree is one array, it can be saved to a file as it is
+(a small header followed by the array's bytes).  MappedBST opens such a
+file with mmap and searches it in place, without reading it into memory
+or making any nodes.  Several processes that open the same file share
+one copy of it in the operating system's page cache.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+if __package__:
+    from .bst_solution import _unique_sorted, create_bst_from_sorted_list
+else:
+    from bst_solution import _unique_sorted, create_bst_from_sorted_list
+
+
+class CompactBST:
+    # This class is a read-only BST stored in a single array
+
+    def __init__(self, sorted_list, typecode="q"):
+        """
+        Build the compact tree from any sorted iterable.  Duplicates are
+        dropped, just like the BST does.  The sorted values are placed
+        into the array with an in-order walk of the implicit tree, using
+        a list as a stack instead of recursion.
+        """
+        values = _unique_sorted(sorted_list)
+        n = len(values)
+        self.keys = array(typecode, bytes(array(typecode).itemsize * (n + 1)))
+        self.typecode = typecode
+        self.count = n
+
+        stack = []
+        position = 0  # The next sorted value to place
+        index = 1     # Start at the root
+        while stack or index <= n:
+            if index <= n:
+                # Keep going left to get to the smaller positions first
+                stack.append(index)
+                index = 2 * index
+            else:
+                index = stack.pop()
+                self.keys[index] = values[position]
+                position += 1
+                index = 2 * index + 1
+
+    @classmethod
+    def from_bst(cls, bst, typecode="q"):
+        # Freeze an existing BST (for example one made by
+        # create_bst_from_sorted_list) into a CompactBST.
+        return cls(bst.in_order(), typecode)
+
+    def __len__(self):
+        return self.count
+
+    def get_height(self):
+        # A complete tree with n values has a height of n.bit_length()
+        return self.count.bit_length()
+
+    def __contains__(self, data):
+        """
+        Checks if data is in the tree.  The search starts at the root
+        (index 1) and moves to the left child (2*i) or the right child
+        (2*i + 1) just like following the links in a BST.
+        """
+        keys = self.keys
+        n = self.count
+        index = 1
+        while index <= n:
+            value = keys[index]
+            if data == value:
+                return True
+            index = 2 * index + (value < data)
+        return False
+
+    def __iter__(self):
+        # Yield the values from smallest to largest (in-order traversal)
+        keys = self.keys
+        n = self.count
+        stack = []
+        index = 1
+        while stack or index <= n:
+            if index <= n:
+                stack.append(index)
+                index = 2 * index
+            else:
+                index = stack.pop()
+                yield keys[index]
+                index = 2 * index + 1
+
+    def search_many(self, probes):
+        """
+        Check a whole NumPy array of 'probes' at once and return a NumPy
+        array of booleans (True where the probe is in the tree).  Every
+        probe moves down one level of the tree per step, so the loop runs
+        only get_height() times no matter how many probes there are.
+        Probes that fall off the bottom of the tree keep reading the last
+        value but can no longer be marked as found.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("CompactBST.search_many requires NumPy") from None
+
+        keys = np.frombuffer(self.keys, dtype=np.dtype(self.typecode))
+        probes = np.asarray(probes)
+        n = self.count
+        found = np.zeros(probes.shape, dtype=bool)
+        index = np.ones(probes.shape, dtype=np.intp)
+        for _ in range(self.get_height()):
+            inside = index <= n
+            values = keys[np.minimum(index, n)]
+            found |= inside & (values == probes)
+            index = 2 * index + (values < probes)
+        return found
+
+    def nbytes(self):
+        # The memory used by the array that holds the values
+        return self.keys.itemsize * len(self.keys)
+
+    def save(self, path):
+        """
+        Write the tree to the file at 'path' so it can be opened again
+        with MappedBST.  The file is a header followed by the bytes of
+        the array exactly as they are in memory.
+        """
+        header = _HEADER.pack(_MAGIC, _VERSION, self.typecode.encode(),
+                              _BYTE_ORDER, self.count)
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(self.keys)
+
+
+# The file header is: a magic number, the format version, the typecode
+# of the array, the byte order it was written in, and the number of values.
+# It is 16 bytes long so the array after it starts on an 8 byte boundary.
+_HEADER = struct.Struct("<4sBcc x Q")
+_MAGIC = b"BSTC"
+_VERSION = 1
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+# The typecodes a saved array can have (the ones memoryview.cast accepts)
+_TYPECODES = "bBhHiIlLqQfd"
+
+
+class MappedBST(CompactBST):
+    """
+    A CompactBST that reads its array straight from a file saved by
+    CompactBST.save.  The file is memory-mapped, and 'keys' is a
+    memoryview of the mapped bytes, so opening the file is instant no
+    matter how big the tree is.  All of the CompactBST searches and
+    traversals work on it unchanged.
+
+    Call close() (or use it in a 'with' statement) to release the file.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            self.file.close()
+            raise ValueError(f"{path} is not a saved BST") from None
+
+        if len(self.map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a saved BST")
+        magic, version, typecode, byte_order, count = _HEADER.unpack_from(self.map)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a saved BST")
+        if byte_order != _BYTE_ORDER:
+            self.close()
+            raise ValueError(f"{path} was saved on a machine with a different byte order")
+
+        self.typecode = typecode.decode("latin-1")
+        if self.typecode not in _TYPECODES:
+            self.close()
+            raise ValueError(f"{path} has an unknown typecode {self.typecode!r}")
+        # Check the size before casting, since cast fails on a partial value
+        if len(self.map) - _HEADER.size != (count + 1) * array(self.typecode).itemsize:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self.count = count
+        self.view = memoryview(self.map)
+        self.keys = self.view[_HEADER.size:].cast(self.typecode)
+
+    def close(self):
+        # The memoryviews must be released before the map can be closed
+        for name in ("keys", "view"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    print("\n=========== TESTS FOR COMPACT BST ===========")
+    compact1 = CompactBST([10, 20, 30, 40, 50, 60, 70])
+    print(list(compact1.keys)) # [0, 40, 20, 60, 10, 30, 50, 70]
+    print(len(compact1), compact1.get_height()) # 7 3
+    print(30 in compact1, 35 in compact1) # True False
+    print(list(CompactBST.from_bst(create_bst_from_sorted_list(range(6))))) # [0, 1, 2, 3, 4, 5]
+    print(CompactBST([]).get_height()) # 0
+
+    print("\n=========== TESTS FOR SAVED BST ===========")
+    import os
+    import tempfile
+    saved_path = os.path.join(tempfile.mkdtemp(), "tree.bst")
+    compact1.save(saved_path)
+    with MappedBST(saved_path) as mapped1:
+        print(len(mapped1), mapped1.get_height()) # 7 3
+        print(60 in mapped1, 65 in mapped1) # True False
+        print(list(mapped1)) # [10, 20, 30, 40, 50, 60, 70]
+    os.remove(saved_path)
+
+
+if __name__ == "__main__":
+    main()
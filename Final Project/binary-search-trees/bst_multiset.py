@@ -0,0 +1,325 @@
+# A Binary Search Tree that counts duplicates, and a parallel way to build one
+
+"""
+The BST ignores a value that is already in the tree, so it cannot tell
+how many times a value was seen.  MultisetBST is a BalancedBST that keeps
+a count for every value: inserting a value again adds 1 to its count,
+count(value) returns it, and remove(value) takes 1 away (the value only
+leaves the tree when its count reaches 0).
+
+build_multiset builds a MultisetBST from a large unsorted input (an
+iterable, or a file with one value per line) in four steps:
+
+1) The input is read in chunks of 'chunk_size' values.
+2) Each chunk is counted and sorted in a separate process (a
+   ProcessPoolExecutor), which writes the sorted (value, count) pairs
+   to a temporary file called a run.  Only a few chunks are in flight
+   at once, so memory stays bounded even if the input is larger than
+   memory.
+3) The runs are merged with heapq.merge, which reads only one batch of
+   each run file at a time, and the counts of equal values are added
+   together.  (If there are more than 64 runs, they are first merged
+   64 at a time into longer runs, so not too many files are open.)
+4) The merged values are already sorted and unique, so the balanced tree
+   is linked together directly with _insert_middle, in O(n).
+
+The values (and 'convert', if given) are sent to other processes, so
+they must be picklable, and each chunk is counted with a Counter, so
+they must be hashable as well.  Pass workers=0 to do everything in this process.
+"""
+import heapq
+import itertools
+import os
+import pickle
+import tempfile
+from collections import Counter
+
+if __package__:
+    from .bst_solution import BST, BalancedBST, _insert_middle, merge_sorted_into_bst
+else:
+    from bst_solution import BST, BalancedBST, _insert_middle, merge_sorted_into_bst
+
+
+_BATCH_SIZE = 10_000 # (value, count) pairs per pickle in a run file
+_MAX_FAN_IN = 64     # The most run files that are open (and merged) at once
+
+
+class MultisetBST(BalancedBST):
+    """
+    A BalancedBST that remembers how many times each value was inserted.
+    The tree holds each value once, in a node that also stores its count.
+    len(), rank() and select() count each value once, like the BST;
+    'total' is the number of values including duplicates.
+    """
+
+    class Node(BST.Node):
+        # A BST node that also counts the copies of its value
+
+        def __init__(self, data):
+            super().__init__(data)
+            self.count = 1
+
+    def __init__(self):
+        super().__init__()
+        self.total = 0
+
+    def insert(self, data, count=1):
+        # Add 'count' copies of 'data'.  Only a new value changes the tree.
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        node = self._find_node(data)
+        if node is not None:
+            node.count += count
+        else:
+            super().insert(data)
+            if count > 1:
+                self._find_node(data).count = count
+        self.total += count
+
+    def count(self, data):
+        # How many copies of 'data' are in the tree (0 if there are none)
+        node = self._find_node(data)
+        return 0 if node is None else node.count
+
+    def remove(self, data):
+        # Remove one copy of 'data'.  Return True if there was one to remove.
+        node = self._find_node(data)
+        if node is None:
+            return False
+        if node.count == 1:
+            super().delete(data)
+        else:
+            node.count -= 1
+        self.total -= 1
+        return True
+
+    def delete(self, data):
+        # Remove every copy of 'data'.  Return True if there were any.
+        node = self._find_node(data)
+        if node is None:
+            return False
+        # Read the count first: if the node has two children, delete
+        # moves its successor's value (and count) into it
+        self.total -= node.count
+        super().delete(data)
+        return True
+
+    def items(self, start=None):
+        # Yield (value, count) pairs in sorted order, starting at 'start'
+        for node in self._in_order(start, True, True):
+            yield node.data, node.count
+
+    def elements(self):
+        # Yield every value in sorted order, repeated as many times as it
+        # was inserted
+        for node in self._in_order(None, True, True):
+            yield from itertools.repeat(node.data, node.count)
+
+    def _find_node(self, data):
+        # Return the node holding 'data', or None if it is not in the tree
+        node = self.root
+        while node is not None and data != node.data:
+            node = node.left if data < node.data else node.right
+        return node
+
+    @staticmethod
+    def _copy_data(node, source):
+        node.data = source.data
+        node.count = source.count
+
+    def _link_sorted(self, sorted_list):
+        # Like the BST, but equal values are counted instead of dropped
+        keys = []
+        counts = []
+        for value in sorted_list:
+            if keys:
+                previous = keys[-1]
+                if value == previous:
+                    counts[-1] += 1
+                    continue
+                if value < previous:
+                    raise ValueError("values must be in sorted order")
+            keys.append(value)
+            counts.append(1)
+        return self._link_counted(keys, counts)
+
+    def _merge_sorted(self, sorted_list):
+        # Merge (value, count) pairs, so the copies of a value are never
+        # read out one by one.  Each new value is one more copy.
+        pairs = heapq.merge(self.items(), ((value, 1) for value in sorted_list), key=_value)
+        keys = []
+        counts = []
+        for value, count in _sum_counts(pairs):
+            # An unsorted 'sorted_list' shows up as a value that goes down
+            if keys and value < keys[-1]:
+                raise ValueError("values must be in sorted order")
+            keys.append(value)
+            counts.append(count)
+        return self._link_counted(keys, counts)
+
+    def _link_counted(self, keys, counts):
+        # Replace everything in the tree with the sorted, unique 'keys',
+        # where counts[i] is the count of keys[i].  Return the tree.
+        self.root = None
+        _insert_middle(keys, 0, len(keys) - 1, self)
+        for node, count in zip(self._in_order(None, True, True), counts):
+            node.count = count
+        self.total = sum(counts)
+        return self
+
+
+def _read_chunks(source, chunk_size):
+    # Yield lists of up to 'chunk_size' values from an iterable, or from
+    # the lines of the file at path 'source' (without their newlines)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as file:
+            lines = (line.rstrip("\n") for line in file)
+            yield from _read_chunks(lines, chunk_size)
+        return
+    iterator = iter(source)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _sort_run(chunk, convert, directory):
+    """
+    Count and sort the values in 'chunk' and write them to a new run file
+    in 'directory' as pickled batches of (value, count) pairs.  Return
+    the path of the run.  This runs in a worker process.
+    """
+    if convert is not None:
+        chunk = map(convert, chunk)
+    return _write_run(sorted(Counter(chunk).items()), directory)
+
+
+def _write_run(pairs, directory):
+    # Write the sorted (value, count) pairs from the iterable 'pairs' to a
+    # new run file in 'directory' and return its path
+    descriptor, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(descriptor, "wb") as file:
+        batch = []
+        for pair in pairs:
+            batch.append(pair)
+            if len(batch) == _BATCH_SIZE:
+                pickle.dump(batch, file, pickle.HIGHEST_PROTOCOL)
+                batch = []
+        if batch:
+            pickle.dump(batch, file, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path):
+    # Yield the (value, count) pairs of a run file one batch at a time
+    with open(path, "rb") as file:
+        while True:
+            try:
+                batch = pickle.load(file)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _sorted_runs(source, chunk_size, convert, workers, directory):
+    # Yield the path of a sorted run for each chunk of 'source'
+    if workers == 0:
+        for chunk in _read_chunks(source, chunk_size):
+            yield _sort_run(chunk, convert, directory)
+        return
+    # Imported here because loading multiprocessing makes importing this
+    # module several times slower
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep at most two chunks per worker waiting or being sorted, so
+        # the input is not all read into memory ahead of the workers
+        limit = 2 * workers
+        pending = []
+        for chunk in _read_chunks(source, chunk_size):
+            pending.append(pool.submit(_sort_run, chunk, convert, directory))
+            if len(pending) >= limit:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def merge_runs(paths):
+    # Yield (value, total count) for every value in the run files, in
+    # sorted order, adding up the counts of a value found in several runs
+    merged = heapq.merge(*(_read_run(path) for path in paths), key=_value)
+    return _sum_counts(merged)
+
+
+def _value(pair):
+    # The value of a (value, count) pair, to sort and group by
+    return pair[0]
+
+
+def _sum_counts(pairs):
+    # Yield (value, total count) for the sorted (value, count) 'pairs',
+    # adding up the counts of the pairs that have the same value
+    for value, group in itertools.groupby(pairs, key=_value):
+        yield value, sum(count for _, count in group)
+
+
+def build_multiset(source, chunk_size=1_000_000, convert=None, workers=None, directory=None):
+    """
+    Build a MultisetBST from 'source', an unsorted iterable of values or
+    the path of a file with one value per line.  'convert' (such as int)
+    is applied to each value by the workers, which is useful for files.
+    'workers' is the number of processes (None uses one per CPU, 0 uses
+    none).  The runs are written to a temporary folder inside 'directory'
+    (the system's temporary folder by default), which is deleted when the
+    tree is built.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as run_directory:
+        paths = list(_sorted_runs(source, chunk_size, convert, workers, run_directory))
+        # With too many runs to open at once, merge them in groups first
+        while len(paths) > _MAX_FAN_IN:
+            merged = []
+            for i in range(0, len(paths), _MAX_FAN_IN):
+                group = paths[i:i + _MAX_FAN_IN]
+                merged.append(_write_run(merge_runs(group), run_directory))
+                for path in group:
+                    os.remove(path)
+            paths = merged
+        keys = []
+        counts = []
+        for value, count in merge_runs(paths):
+            keys.append(value)
+            counts.append(count)
+    return MultisetBST()._link_counted(keys, counts)
+
+
+def main():
+    print("\n=========== TESTS FOR MULTISET BST ===========")
+    tree1 = MultisetBST()
+    for x in [5, 3, 5, 8, 5, 3]:
+        tree1.insert(x)
+    print(list(tree1.items())) # [(3, 2), (5, 3), (8, 1)]
+    print(len(tree1), tree1.total, tree1.count(5), tree1.count(4)) # 3 6 3 0
+    print(tree1.remove(5), tree1.count(5), 5 in tree1) # True 2 True
+    print(tree1.remove(8), tree1.remove(8), 8 in tree1) # True False False
+    print(tree1.delete(5), list(tree1.elements())) # True [3, 3]
+    merge_sorted_into_bst(tree1, [1, 3, 9])  # The counts are kept
+    print(list(tree1.items()), tree1.total) # [(1, 1), (3, 3), (9, 1)] 5
+
+    print("\n=========== TESTS FOR PARALLEL BUILD ===========")
+    values = [x % 7 for x in range(1000)]
+    tree2 = build_multiset(reversed(values), chunk_size=100)
+    print(len(tree2), tree2.total, tree2.count(0), tree2.count(6)) # 7 1000 143 142
+    print(tree2.get_height(), tree2.root.data) # 3 3
+    path = os.path.join(tempfile.mkdtemp(), "values.txt")
+    with open(path, "w") as file:
+        file.writelines(f"{x % 10}\n" for x in range(95))
+    tree3 = build_multiset(path, chunk_size=20, convert=int, workers=2)
+    print(list(tree3.items(start=7))) # [(7, 9), (8, 9), (9, 9)]
+    os.remove(path)
+    tree3.insert(10)
+    print(tree3.count(10), tree3.total) # 1 96
+
+
+if __name__ == "__main__":
+    main()
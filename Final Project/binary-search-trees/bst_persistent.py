@@ -0,0 +1,189 @@
+# A persistent (copy-on-write) balanced Binary Search Tree
+
+"""
+The BST and BalancedBST change node.left and node.right in place when
+data is inserted or deleted.  If another thread is searching the tree at
+the same moment, it can see the tree half way through a change, so every
+reader and writer would have to share a lock.
+
+PersistentBST never changes a node once other code can see it.  To insert
+or delete, it copies only the nodes on the path from the root down to the
+change (about log n of them) and links the copies to the untouched
+sub-trees of the old tree.  When the new tree is finished, 'root' is
+pointed at it in a single assignment.
+
+A reader calls snapshot() to get its own PersistentBST that shares the
+current root.  That takes O(1) time, never waits for the writer, and the
+snapshot keeps seeing the same values no matter what is inserted or
+deleted afterwards.  Only one thread should write to the same tree.
+"""
+if __package__:
+    from .bst_solution import BST, BalancedBST
+else:
+    from bst_solution import BST, BalancedBST
+
+
+class PersistentBST(BalancedBST):
+    # This class is a BalancedBST whose nodes are never changed in place
+
+    def snapshot(self):
+        # A new tree that shares every node with this one.  Both trees can
+        # be changed afterwards without affecting each other.
+        tree = PersistentBST()
+        tree.root = self.root
+        return tree
+
+    def insert(self, data):
+        # This function will insert 'data' into a new version of the tree.
+        # Loop down from the root to find the empty spot, remembering each
+        # node we pass.  Those nodes are copied and the new node is linked
+        # to the copy of its parent.
+        if self.root is None:
+            self.root = BST.Node(data)
+            return
+
+        path = []
+        node = self.root
+        while node is not None:
+            if data == node.data:
+                return  # Duplicates are ignored, just like in the BST
+            path.append(node)
+            if data < node.data:
+                node = node.left
+            else:
+                node = node.right
+
+        copies = PersistentBST._copy_path(path)
+        parent = copies[-1]
+        if data < parent.data:
+            parent.left = BST.Node(data)
+        else:
+            parent.right = BST.Node(data)
+
+        self._fix_path(copies)
+
+    def delete(self, data):
+        """
+        Remove 'data' from a new version of the tree.  Return True if the
+        data was found and removed, otherwise return False.  The path to
+        the node (and on to its successor, if it has two children) is
+        copied first, so the changes are only made to the copies.
+        """
+        path = []
+        node = self.root
+        while node is not None and data != node.data:
+            path.append(node)
+            if data < node.data:
+                node = node.left
+            else:
+                node = node.right
+
+        # The data is not in the tree
+        if node is None:
+            return False
+
+        path.append(node)
+        target = len(path) - 1
+        if node.left is not None and node.right is not None:
+            # Find the successor by going right once and then all the
+            # way to the left.
+            successor = node.right
+            while successor is not None:
+                path.append(successor)
+                successor = successor.left
+
+        copies = PersistentBST._copy_path(path)
+        removed = copies.pop()
+        if target < len(copies):
+            copies[target].data = removed.data
+
+        # The removed node has at most one child, which takes its place
+        child = removed.left if removed.left is not None else removed.right
+        if copies:
+            BST._replace_child(copies[-1], removed, child)
+            self._fix_path(copies)
+        else:
+            self.root = child
+        return True
+
+    def _fix_path(self, path):
+        """
+        Walk backwards up the copied 'path', updating heights and sizes
+        and rotating where needed (just like BalancedBST).  The root of
+        the finished tree is published to self.root last, so a reader
+        never sees a partly built tree.
+        """
+        root = path[0]
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            new_node = self._rebalance(node)
+            if new_node is not node:
+                if i == 0:
+                    root = new_node
+                else:
+                    BST._replace_child(path[i - 1], node, new_node)
+        self.root = root
+
+    @staticmethod
+    def _copy(node):
+        # Make a new node with the same data, links, height and size
+        copy = BST.Node(node.data)
+        copy.left = node.left
+        copy.right = node.right
+        copy.height = node.height
+        copy.size = node.size
+        return copy
+
+    @staticmethod
+    def _copy_path(path):
+        """
+        Copy every node in 'path' (a list of nodes from the root going
+        down) and link each copy to the copy of the node below it in
+        place of the original.  Return the list of copies.
+        """
+        copies = [PersistentBST._copy(node) for node in path]
+        for i in range(len(path) - 1):
+            BST._replace_child(copies[i], path[i + 1], copies[i + 1])
+        return copies
+
+    @staticmethod
+    def _rotate_left(node):
+        # Same as BalancedBST, but both nodes that change are copied first
+        # because either of them may be shared with an older snapshot.
+        node = PersistentBST._copy(node)
+        new_root = PersistentBST._copy(node.right)
+        node.right = new_root.left
+        new_root.left = node
+        BST._update(node)
+        BST._update(new_root)
+        return new_root
+
+    @staticmethod
+    def _rotate_right(node):
+        # Same as BalancedBST, but both nodes that change are copied first
+        node = PersistentBST._copy(node)
+        new_root = PersistentBST._copy(node.left)
+        node.left = new_root.right
+        new_root.right = node
+        BST._update(node)
+        BST._update(new_root)
+        return new_root
+
+
+def main():
+    print("\n=========== TESTS FOR PERSISTENT BST ===========")
+    ptree1 = PersistentBST()
+    for x in range(1, 8):
+        ptree1.insert(x)
+    snapshot1 = ptree1.snapshot()
+    ptree1.insert(8)
+    ptree1.delete(4)
+    print(len(snapshot1), 4 in snapshot1, 8 in snapshot1) # 7 True False
+    print(len(ptree1), 4 in ptree1, 8 in ptree1) # 7 False True
+    print(list(snapshot1.range(1, 8))) # [1, 2, 3, 4, 5, 6, 7]
+    print(list(ptree1.range(1, 8))) # [1, 2, 3, 5, 6, 7, 8]
+    print(snapshot1.root.left is ptree1.root.left) # True .. the left side is shared
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,25 @@
-from logging import root
+import heapq
+from collections import deque
 
 
 class BST:
     # This class is to implement a Binary Search Tree
 
     class Node:
-        # Each node has data and links to the left and right sub-tree
+        # Each node has data and links to the left and right sub-tree.
+        # It also remembers the height of its sub-tree and how many
+        # nodes are in it, so neither has to be counted again later.
+        # (New nodes are made with self.Node, so a subclass of the BST
+        # can use its own kind of node.)
 
         def __init__(self, data):
-            # Initialize the node to the data. Links are set to None
+            # Initialize the node to the data. Links are set to None.
+            # A new node is always a leaf, so its height and size are 1.
             self.data = data
             self.left = None
             self.right = None
+            self.height = 1
+            self.size = 1
 
     def __init__(self):
         # Initialize an empty BST.
@@ -20,41 +28,424 @@ class BST:
     def insert(self, data):
         # This function will insert 'data' into the BST.  
         # If the BST is empty, then set the root equal to the new 
-        # node.  Otherwise, use _insert to recursively
-        # find the location to insert.
+        # node.  Otherwise, use _insert to find the location to insert.
         if self.root is None:
-            self.root = BST.Node(data)
+            self.root = self.Node(data)
         else:
             self._insert(data, self.root)  # Start at the root
 
     def _insert(self, data, node):
         """
         This function will look for a place to insert a node
-        with 'data' inside of it.  The current sub-tree is
+        with 'data' inside of it.  The search starts at the sub-tree
         represented by 'node'.  This function is intended to be
         called the first time by the insert function.
+
+        Instead of calling itself recursively, this function loops down
+        the tree and keeps a list of the nodes it passed through (the
+        path).  Once the new node is linked in, the heights and sizes
+        of the nodes on the path are updated from the bottom up.
         """
+        path = []
+        while True:
+            if data == node.data:
+                return
+            path.append(node)
+            if data < node.data:
+                # The data belongs on the left side.
+                if node.left is None:
+                    # We found an empty spot
+                    node.left = self.Node(data)
+                    break
+                # Need to keep looking on the left sub-tree.
+                node = node.left
+            else: 
+                # The data belongs on the right side.
+                if node.right is None:
+                    # We found an empty spot
+                    node.right = self.Node(data)
+                    break
+                # Need to keep looking on the right sub-tree.
+                node = node.right
 
-        if data == node.data:
-            return
-        elif data < node.data:
-            # The data belongs on the left side.
-            if node.left is None:
-                # We found an empty spot
-                node.left = BST.Node(data)
+        self._fix_path(path)
+
+    def delete(self, data):
+        """
+        Remove 'data' from the BST.  Return True if the data was found
+        and removed, otherwise return False.  If the node to remove has
+        two children, its data is replaced with the smallest data from
+        its right sub-tree (the successor) and the successor node is the
+        one that actually gets unlinked.
+        """
+        path = []
+        node = self.root
+        while node is not None and data != node.data:
+            path.append(node)
+            if data < node.data:
+                node = node.left
+            else:
+                node = node.right
+
+        # The data is not in the tree
+        if node is None:
+            return False
+
+        if node.left is not None and node.right is not None:
+            # Find the successor by going right once and then all the
+            # way to the left.
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            self._copy_data(node, successor)
+            node = successor
+
+        # The node now has at most one child, which takes its place
+        child = node.left if node.left is not None else node.right
+        if path:
+            BST._replace_child(path[-1], node, child)
+        else:
+            self.root = child
+
+        self._fix_path(path)
+        return True
+
+    @staticmethod
+    def _copy_data(node, source):
+        # Copy the value held by 'source' into 'node' (delete uses this to
+        # move the successor's value up).  MultisetBST also copies the count.
+        node.data = source.data
+
+    def __len__(self):
+        # The root already knows how many nodes are in the whole tree
+        return BST._size(self.root)
+
+    def __contains__(self, data):
+        """ 
+        Checks if data is in the BST.  This function
+        supports the ability to use the 'in' keyword:
+
+        if 5 in my_bst:
+            ("5 is in the bst")
+
+        """
+        return self.contains(data)
+
+    def contains(self, data):
+        # Loop down from the root, going left or right, until the data
+        # is found or we fall off the bottom of the tree.
+        node = self.root
+        while node is not None:
+            if data == node.data:
+                return True
+            elif data < node.data:
+                node = node.left
+            else:
+                node = node.right
+        return False
+
+    def floor(self, data):
+        """
+        Return the largest value in the BST that is less than or equal
+        to 'data', or None if every value is larger.  Every time we go
+        right, the node we left is the best answer found so far.
+        """
+        best = None
+        node = self.root
+        while node is not None:
+            if data == node.data:
+                return node.data
+            elif data < node.data:
+                node = node.left
+            else:
+                best = node.data
+                node = node.right
+        return best
+
+    def ceiling(self, data):
+        """
+        Return the smallest value in the BST that is greater than or
+        equal to 'data', or None if every value is smaller.  Every time
+        we go left, the node we left is the best answer found so far.
+        """
+        best = None
+        node = self.root
+        while node is not None:
+            if data == node.data:
+                return node.data
+            elif data < node.data:
+                best = node.data
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def rank(self, data):
+        """
+        Return how many values in the BST are less than 'data'.  Each
+        time we go right, the node and everything in its left sub-tree
+        are smaller, and the sizes stored in the nodes tell us how many
+        that is without counting them.  This is O(height).
+        """
+        count = 0
+        node = self.root
+        while node is not None:
+            if data < node.data:
+                node = node.left
+            elif data > node.data:
+                count += 1 + BST._size(node.left)
+                node = node.right
+            else:
+                return count + BST._size(node.left)
+        return count
+
+    def select(self, index):
+        """
+        Return the value at position 'index' (starting at 0) if all the
+        values were in sorted order, so select(0) is the smallest value
+        and select(len(bst) - 1) is the largest.  This is the opposite
+        of rank.  An IndexError is raised if 'index' is out of range.
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError("BST index out of range")
+        node = self.root
+        while True:
+            left_size = BST._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index > left_size:
+                # Skip over the left sub-tree and this node
+                index -= left_size + 1
+                node = node.right
+            else:
+                return node.data
+
+    def range(self, low, high):
+        """
+        Yield every value from 'low' to 'high' (both included) in sorted
+        order.  This is a generator, so values are only found as the loop
+        asks for them.  Sub-trees that are entirely below 'low' are never
+        entered, and the loop stops at the first value above 'high', so
+        only the nodes inside the range (plus the path to them) are
+        visited.
+        """
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                if node.data < low:
+                    # This node and its left sub-tree are too small
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if node.data > high:
+                    return
+                yield node.data
+                node = node.right
+
+    # The traversals below are generators that keep their own stack (a
+    # list) instead of calling themselves recursively, so they work on
+    # trees of any height.  The stack only ever holds nodes from one path
+    # down the tree, so they use O(height) memory.  Each one can start
+    # (or pick up again, like a cursor) from a key: pass the last key
+    # that was read as 'start' with inclusive=False to continue after it.
+
+    def __iter__(self):
+        # Iterate forward through the tree (smallest first)
+        return self.in_order()
+
+    def __reversed__(self):
+        # Iterate backward through the tree (largest first)
+        return self.reverse_order()
+
+    def in_order(self, start=None, inclusive=True):
+        """
+        Yield the values from smallest to largest, starting at 'start'
+        (the first value >= start, or > start if 'inclusive' is False)
+        or at the smallest value if 'start' is None.  Sub-trees that are
+        entirely before 'start' are skipped, so starting in the middle
+        costs O(height), not a walk over the smaller values.
+        """
+        return self._in_order(start, inclusive, False)
+
+    def _in_order(self, start, inclusive, nodes):
+        # The walk behind in_order.  If 'nodes' is True, the nodes are
+        # yielded instead of their values (MultisetBST reads the counts
+        # stored in them).
+        stack = []
+        node = self.root
+        while node is not None:
+            if start is not None and (node.data < start or (not inclusive and node.data == start)):
+                # This node and its left sub-tree come before 'start'
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        while stack:
+            node = stack.pop()
+            yield node if nodes else node.data
+            # Next come the values in the right sub-tree, smallest first
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def reverse_order(self, start=None, inclusive=True):
+        """
+        Yield the values from largest to smallest, starting at 'start'
+        (the first value <= start, or < start if 'inclusive' is False)
+        or at the largest value if 'start' is None.  This is in_order
+        with left and right swapped.
+        """
+        stack = []
+        node = self.root
+        while node is not None:
+            if start is not None and (node.data > start or (not inclusive and node.data == start)):
+                node = node.left
             else:
-                # Need to keep looking.  Call _insert
-                # recursively on the left sub-tree.
-                self._insert(data, node.left)
-        else: 
-            # The data belongs on the right side.
-            if node.right is None:
-                # We found an empty spot
-                node.right = BST.Node(data)
+                stack.append(node)
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node.data
+            node = node.left
+            while node is not None:
+                stack.append(node)
+                node = node.right
+
+    def pre_order(self, start=None, inclusive=True):
+        """
+        Yield each node's value before the values of its left and then
+        its right sub-tree (the order to copy a tree in, since inserting
+        the values in this order rebuilds the same shape).  If 'start' is
+        given, the traversal picks up at that value, which must be in the
+        tree (a KeyError is raised if it is not).
+        """
+        # The stack holds the right sub-trees still waiting to be visited
+        stack = []
+        node = self.root
+        if start is not None:
+            # Walk down to 'start'.  Each time we go left, the right
+            # sub-tree we pass comes after 'start' and is remembered.
+            while node is not None and node.data != start:
+                if start < node.data:
+                    if node.right is not None:
+                        stack.append(node.right)
+                    node = node.left
+                else:
+                    node = node.right
+            if node is None:
+                raise KeyError(start)
+            if not inclusive:
+                # Skip 'start' itself but not its sub-trees
+                if node.right is not None:
+                    stack.append(node.right)
+                node = node.left
+        if node is not None:
+            stack.append(node)
+        while stack:
+            node = stack.pop()
+            yield node.data
+            # Push right first so that the left sub-tree is visited first
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def level_order(self, start=None, inclusive=True):
+        """
+        Yield the values one level at a time, from the root down, and from
+        left to right (smallest to largest) within each level.  A queue
+        holds the nodes of the next level, so each node is visited once
+        (O(n) even for a tree that has turned into a chain).
+
+        If 'start' is given, the traversal picks up at that value, which
+        must be in the tree (a KeyError is raised if it is not): the rest
+        of its level is the values on that level greater than 'start'.
+        """
+        first_level = 0
+        if start is not None:
+            node = self.root
+            while node is not None and node.data != start:
+                node = node.left if start < node.data else node.right
+                first_level += 1
+            if node is None:
+                raise KeyError(start)
+        queue = deque([self.root] if self.root is not None else [])
+        level = 0
+        while queue:
+            low = start if level == first_level else None
+            # The nodes in the queue right now are exactly this level
+            for _ in range(len(queue)):
+                node = queue.popleft()
+                if level >= first_level and (low is None or low < node.data or (inclusive and low == node.data)):
+                    yield node.data
+                if node.left is not None:
+                    queue.append(node.left)
+                if node.right is not None:
+                    queue.append(node.right)
+            level += 1
+
+    def _link_sorted(self, sorted_list):
+        # Replace everything in the tree with the values from the sorted
+        # iterable 'sorted_list', linking the nodes together in one O(n)
+        # pass (see create_bst_from_sorted_list).  Return the tree.
+        keys = _unique_sorted(sorted_list)
+        self.root = None
+        return _insert_middle(keys, 0, len(keys)-1, self)
+
+    def _merge_sorted(self, sorted_list):
+        # Merge the values in the tree with the sorted iterable
+        # 'sorted_list' and relink the tree from the result (see
+        # merge_sorted_into_bst).  Return the tree.
+        return self._link_sorted(heapq.merge(self.in_order(), sorted_list))
+
+    def _fix_path(self, path):
+        """
+        Walk backwards up the 'path' (a list of nodes from the root down
+        to where the tree changed) and update the height and size that
+        each node stores.  BalancedBST overrides this to also rotate.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            BST._update(path[i])
+
+    @staticmethod
+    def _replace_child(parent, old_child, new_child):
+        # Point 'parent' at 'new_child' on the side where 'old_child' was
+        if parent.left is old_child:
+            parent.left = new_child
+        else:
+            parent.right = new_child
+
+    @staticmethod
+    def _size(node):
+        # An empty sub-tree has no nodes
+        return node.size if node is not None else 0
+
+    @staticmethod
+    def _update(node):
+        # The height is 1 plus the height of the taller child and the
+        # size is 1 plus the sizes of both children.
+        left = node.left
+        right = node.right
+        if left is None:
+            if right is None:
+                node.height = 1
+                node.size = 1
             else:
-                # Need to keep looking.  Call _insert
-                # recursively on the right sub-tree.
-                self._insert(data, node.right)
+                node.height = right.height + 1
+                node.size = right.size + 1
+        elif right is None:
+            node.height = left.height + 1
+            node.size = left.size + 1
+        else:
+            node.height = 1 + max(left.height, right.height)
+            node.size = 1 + left.size + right.size
   
     # ###################
     # # Example Problem #
@@ -67,40 +458,112 @@ class BST:
         have a height of 1.
         
         If the tree is empty, then return 0.  Otherwise, call 
-        _get_height on the root which will recursively determine the 
-        height of the tree.
+        _get_height on the root which will look up the height of
+        the tree.
         """
         if self.root is None:
             return 0
         else:
             return self._get_height(self.root)  # Start at the root
 
-    def _get_height(self, node):
+    @staticmethod
+    def _get_height(node):
         """
         Determine the height of the BST.  The height of a sub-tree 
         (represented by 'node') is 1 plus the height of either the 
         left sub-tree or the right sub-tree (whichever one is bigger).
 
-        This function intended to be called the first time by 
-        get_height.
+        Every node keeps its height up to date when the tree changes,
+        so there is nothing to count here.  An empty sub-tree (None)
+        has a height of 0.
         """
         # base case
         if node is None:
             return 0
 
-        # Use recursion to get height of left side
-        height_left = self._get_height(node.left)
-        # Use recursion to get height of right side
-        height_right = self._get_height(node.right)
-
-        # Use max to determine which is greater height and add 1
-        return 1 + max(height_left, height_right) 
+        return node.height
             
+
+class BalancedBST(BST):
+    """
+    A self-balancing (AVL) version of the BST.  Every node remembers the
+    height of its own sub-tree.  After each insert or delete we walk back
+    up the path we came down and rotate any node whose left and right
+    sub-trees differ in height by more than 1.  This keeps the height of
+    the tree at O(log n) no matter what order the data arrives in, even
+    when the data is already sorted.
+
+    Insert and delete come from the BST, which loops down the tree and
+    keeps the path in a list, so very large trees do not hit Python's
+    recursion limit.  Only _fix_path is different.
+    """
+
+    def _fix_path(self, path):
+        """
+        Walk backwards up the 'path', update each node's height and size
+        and rotate any node that has become unbalanced.  The rotated
+        sub-tree root is linked back into its parent (or becomes the new
+        root of the tree).
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            new_node = self._rebalance(node)
+            if new_node is not node:
+                if i == 0:
+                    self.root = new_node
+                else:
+                    BST._replace_child(path[i - 1], node, new_node)
+
+    @staticmethod
+    def _rotate_left(node):
+        # The right child moves up and 'node' becomes its left child
+        new_root = node.right
+        node.right = new_root.left
+        new_root.left = node
+        BST._update(node)
+        BST._update(new_root)
+        return new_root
+
+    @staticmethod
+    def _rotate_right(node):
+        # The left child moves up and 'node' becomes its right child
+        new_root = node.left
+        node.left = new_root.right
+        new_root.right = node
+        BST._update(node)
+        BST._update(new_root)
+        return new_root
+
+    @classmethod
+    def _rebalance(cls, node):
+        """
+        Update the height and size of 'node' and, if the heights of its
+        left and right sub-trees differ by more than 1, rotate to fix it.
+        Return the node that is now the root of this sub-tree.
+        """
+        BST._update(node)
+        height = BST._get_height
+        balance = height(node.left) - height(node.right)
+
+        # Left side is too tall
+        if balance > 1:
+            if height(node.left.left) < height(node.left.right):
+                node.left = cls._rotate_left(node.left)
+            return cls._rotate_right(node)
+
+        # Right side is too tall
+        if balance < -1:
+            if height(node.right.right) < height(node.right.left):
+                node.right = cls._rotate_right(node.right)
+            return cls._rotate_left(node)
+
+        return node
+
     # ##################
     # Problem to Solve #
     # ##################
 
-def create_bst_from_sorted_list(sorted_list):
+def create_bst_from_sorted_list(sorted_list, tree_class=BST):
     """
     Given a sorted list, create a balanced BST.  
     To get a balanced BST, the _insert_middle function is called to 
@@ -108,10 +571,104 @@ def create_bst_from_sorted_list(sorted_list):
     _insert_middle function takes the whole list but also takes a 
     range (first to last) to consider.  For the first call, the full 
     range of 0 to len()-1 used.
+
+    'sorted_list' can be any sorted iterable (a list, a range, a file
+    or a generator).  It is read once by _unique_sorted, which also
+    drops duplicates the same way insert would (a MultisetBST counts
+    them instead, again like its insert).  The tree is built in
+    a single O(n) pass.  Pass tree_class=BalancedBST to get a tree that
+    stays balanced as more data is inserted later.
     """
-    bst = BST()  # Create an empty BST to start with 
-    _insert_middle(sorted_list, 0, len(sorted_list)-1, bst)
-    return bst
+    bst = tree_class()  # Create an empty BST to start with 
+    return bst._link_sorted(sorted_list)
+
+def merge_sorted_into_bst(bst, sorted_list):
+    """
+    Fold the values from 'sorted_list' (any sorted iterable) into an
+    existing 'bst'.  Inserting the values one at a time would cost
+    O(m log n).  Instead, the values already in the tree (read in order)
+    and the new values are merged like two sorted piles of cards, and
+    the tree is rebuilt once from the result in O(n + m).  The same
+    'bst' object is returned with its new root.
+    """
+    return bst._merge_sorted(sorted_list)
+
+def merge_trees(*trees, reverse=False):
+    """
+    Yield every value from all of the 'trees' in sorted order (largest
+    first if 'reverse' is True), including a value once for each tree
+    that has it.  Only one value per tree is held at a time, so the
+    trees are streamed, never copied into lists.
+    """
+    if reverse:
+        return heapq.merge(*(reversed(tree) for tree in trees), reverse=True)
+    return heapq.merge(*trees)
+
+def union_trees(*trees, reverse=False):
+    # Yield every value that is in at least one of the 'trees', once,
+    # in sorted order.  Equal values come out of merge_trees together.
+    previous = None
+    first = True
+    for value in merge_trees(*trees, reverse=reverse):
+        if first or value != previous:
+            yield value
+            previous = value
+            first = False
+
+def intersect_trees(*trees):
+    """
+    Yield the values that are in every one of the 'trees', in sorted
+    order.  Instead of reading every value, the trees take turns: each
+    one jumps ahead (with ceiling) to the smallest value it has that is
+    >= the current candidate.  When every tree in a row lands on the
+    same value, it is in all of them.  Each jump is O(height), so trees
+    that share few values are intersected without reading most of them.
+    """
+    if not trees:
+        return
+    key = next(iter(trees[0]), None)
+    if key is None:
+        return
+    agreed = 1 # How many trees in a row have 'key'
+    i = 0
+    while True:
+        if agreed == len(trees):
+            yield key
+            # Move on to the next value of the tree we are at
+            key = next(trees[i].in_order(key, inclusive=False), None)
+            if key is None:
+                return
+            agreed = 1
+            continue
+        i = (i + 1) % len(trees)
+        found = trees[i].ceiling(key)
+        if found is None:
+            return
+        if found == key:
+            agreed += 1
+        else:
+            key = found
+            agreed = 1
+
+def _unique_sorted(sorted_list):
+    """
+    Read every value from the sorted iterable 'sorted_list' into a new
+    list, skipping values equal to the one before (the BST does not
+    store duplicates).  A ValueError is raised if a value is smaller
+    than the one before it, because the tree built from it would not
+    be a valid BST.
+    """
+    keys = []
+    append = keys.append
+    for value in sorted_list:
+        if keys:
+            previous = keys[-1]
+            if value == previous:
+                continue
+            if value < previous:
+                raise ValueError("values must be in sorted order")
+        append(value)
+    return keys
 
 def _insert_middle(sorted_list, first, last, bst):
     """
@@ -125,10 +682,11 @@ def _insert_middle(sorted_list, first, last, bst):
     last = 5
 
     then the value 30 (index 2 which is the middle) would be added 
-    to the 'bst' (the insert function above can be used to do this).   
+    to the 'bst' as its root.
 
-    Subsequent recursive calls are made to insert the middle from the values before 30 and the values after 30.  If done correctly, the order
-    in which values are added (which results in a balanced bst) will be:
+    The same is then done for the values before 30 and the values after 30.
+    If done correctly, the order in which values are added (which results
+    in a balanced bst) will be:
 
     30, 10, 20, 50, 40, 60
 
@@ -136,46 +694,132 @@ def _insert_middle(sorted_list, first, last, bst):
     create_bst_from_sorted_list.
 
     The purpose for having the first and last parameters is so that we do 
-    not need to create new sublists when we make recursive calls.  Avoid 
-    using list slicing to create sublists to solve this problem.
+    not need to create new sublists.  Avoid using list slicing to create
+    sublists to solve this problem.
+
+    Rather than calling bst.insert (which would search down from the root
+    every time) each new node is linked straight to its parent.  The
+    ranges still waiting to be added are kept on a stack instead of
+    using recursion.  The size of each node's sub-tree is the size of
+    its range and the height follows from the size, so both are set as
+    the node is made.
     """
     # Check base case
     if first > last:
         return bst
-    
-    # Find the middle element of the sorted list
-    middle = (first + last) // 2
-    
-    # Insert the middle element of the sorted list into the bst
-    bst.insert(sorted_list[middle])
-
-    # Create a new node from the middle element
-    node = BST.Node(sorted_list[middle])
-    
-    # Wrap the recursion into an if statement to prevent max recursions 
-    if middle > first:
-        # Use recursion to continue inserting higher values on the left
-        node.left = _insert_middle(sorted_list, first, middle - 1, bst)
-
-    # Wrap the recursion into an if statement to prevent max recursions
-    if middle < last:
-        # Use recursion to continue inserting lower values on the right
-        node.right = _insert_middle(sorted_list, middle + 1, last, bst)
-    
-    return root
-
-
-print("\n=========== TESTS FOR PROBLEM TO SOLVE ===========")
-tree1 = create_bst_from_sorted_list([10, 20, 30, 40, 50, 60])
-tree2 = create_bst_from_sorted_list([x for x in range(127)]) # 2^7 - 1 nodes
-tree3 = create_bst_from_sorted_list([x for x in range(128)]) # 2^7 nodes
-tree4 = create_bst_from_sorted_list([42])
-tree5 = create_bst_from_sorted_list([])
-print(tree1.get_height()) # 3
-print(tree2.get_height()) # 7 .. any higher and its not balanced
-print(tree3.get_height()) # 8 .. any higher and its not balanced
-print(tree4.get_height()) # 1
-print(tree5.get_height()) # 0
 
+    # Each entry is (first, last, parent node, is it the left child)
+    ranges = [(first, last, None, False)]
+    while ranges:
+        first, last, parent, is_left = ranges.pop()
+
+        # Find the middle element of the sorted list
+        middle = (first + last) // 2
+
+        # Create a new node from the middle element
+        node = bst.Node(sorted_list[middle])
+        count = last - first + 1
+        node.size = count
+        node.height = count.bit_length()
+
+        # Link the node into the tree
+        if parent is None:
+            bst.root = node
+        elif is_left:
+            parent.left = node
+        else:
+            parent.right = node
+
+        # Continue with the higher values on the right (pushed first so
+        # that the lower values on the left are added first)
+        if middle < last:
+            ranges.append((middle + 1, last, node, False))
+
+        # Continue with the lower values on the left
+        if middle > first:
+            ranges.append((first, middle - 1, node, True))
+
+    return bst
+
+
+def main():
+    print("\n=========== TESTS FOR PROBLEM TO SOLVE ===========")
+    tree1 = create_bst_from_sorted_list([10, 20, 30, 40, 50, 60])
+    tree2 = create_bst_from_sorted_list([x for x in range(127)]) # 2^7 - 1 nodes
+    tree3 = create_bst_from_sorted_list([x for x in range(128)]) # 2^7 nodes
+    tree4 = create_bst_from_sorted_list([42])
+    tree5 = create_bst_from_sorted_list([])
+    print(tree1.get_height()) # 3
+    print(tree2.get_height()) # 7 .. any higher and its not balanced
+    print(tree3.get_height()) # 8 .. any higher and its not balanced
+    print(tree4.get_height()) # 1
+    print(tree5.get_height()) # 0
+
+    print("\n=========== TESTS FOR BALANCED BST ===========")
+    tree6 = BalancedBST()
+    for x in range(1000):  # Sorted input would make a plain BST a linked chain
+        tree6.insert(x)
+    print(tree6.get_height()) # 10 .. log2(1000) rounded up
+    tree7 = BalancedBST()
+    for x in [50, 30, 70, 20, 40, 60, 80]:
+        tree7.insert(x)
+    print(tree7.delete(30)) # True
+    print(tree7.delete(35)) # False
+    print(tree7.delete(50)) # True
+    print(tree7.get_height()) # 3
+    for x in range(1000):
+        tree6.delete(x)
+    print(tree6.get_height()) # 0
+
+    print("\n=========== TESTS FOR HEIGHT AND SIZE ===========")
+    print(len(tree2)) # 127
+    print(len(tree5)) # 0
+    print(len(tree7)) # 5
+    tree8 = BST()
+    for x in range(5000):  # Too deep for the old recursive _insert
+        tree8.insert(x)
+    print(tree8.get_height()) # 5000
+    print(tree8.delete(0)) # True
+    print(len(tree8), tree8.get_height()) # 4999 4999
+
+    print("\n=========== TESTS FOR BULK LOAD AND MERGE ===========")
+    tree9 = create_bst_from_sorted_list(x for x in range(1, 8))  # A generator
+    print(tree9.root.data, tree9.root.left.data, tree9.root.right.data) # 4 2 6
+    tree10 = create_bst_from_sorted_list([1, 1, 2, 2, 3])
+    print(len(tree10), tree10.get_height()) # 3 2
+    merge_sorted_into_bst(tree9, [0, 4, 8, 9, 10])
+    print(len(tree9), tree9.get_height()) # 11 4
+    print(list(tree9.in_order())) # [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    tree11 = create_bst_from_sorted_list(range(1000), BalancedBST)
+    tree11.insert(1000)
+    print(len(tree11), tree11.get_height()) # 1001 11
+
+    print("\n=========== TESTS FOR SEARCH AND RANGE QUERIES ===========")
+    tree12 = create_bst_from_sorted_list([10, 20, 30, 40, 50, 60])
+    print(30 in tree12, 35 in tree12) # True False
+    print(tree12.floor(35), tree12.ceiling(35)) # 30 40
+    print(tree12.floor(5), tree12.ceiling(65)) # None None
+    print(tree12.rank(10), tree12.rank(35), tree12.rank(100)) # 0 3 6
+    print(tree12.select(0), tree12.select(3), tree12.select(5)) # 10 40 60
+    print(list(tree12.range(15, 50))) # [20, 30, 40, 50]
+
+    print("\n=========== TESTS FOR TRAVERSALS ===========")
+    tree13 = create_bst_from_sorted_list(range(1, 8))
+    print(list(tree13), list(reversed(tree13))) # [1, 2, 3, 4, 5, 6, 7] [7, 6, 5, 4, 3, 2, 1]
+    print(list(tree13.pre_order())) # [4, 2, 1, 3, 6, 5, 7]
+    print(list(tree13.level_order())) # [4, 2, 6, 1, 3, 5, 7]
+    print(list(tree13.in_order(3.5)), list(tree13.in_order(5, inclusive=False))) # [4, 5, 6, 7] [6, 7]
+    print(list(tree13.reverse_order(3))) # [3, 2, 1]
+    print(list(tree13.pre_order(3)), list(tree13.level_order(3))) # [3, 6, 5, 7] [3, 5, 7]
+    print(list(tree8.pre_order(4995))) # [4995, 4996, 4997, 4998, 4999] .. no recursion limit
+
+    print("\n=========== TESTS FOR MERGING TREES ===========")
+    tree14 = create_bst_from_sorted_list([1, 3, 5, 7, 9])
+    tree15 = create_bst_from_sorted_list([3, 4, 5, 6, 7])
+    print(list(merge_trees(tree14, tree15))) # [1, 3, 3, 4, 5, 5, 6, 7, 7, 9]
+    print(list(union_trees(tree14, tree15))) # [1, 3, 4, 5, 6, 7, 9]
+    print(list(intersect_trees(tree14, tree15, tree13))) # [3, 5, 7]
 
 
+if __name__ == "__main__":
+    main()
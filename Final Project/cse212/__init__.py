@@ -0,0 +1,96 @@
+# The tutorial data structures as one importable package
+
+"""
+The code for each tutorial lives in its own folder (stacks, linked-lists
+and binary-search-trees).  Those folder names have dashes in them, so
+they cannot be imported directly.  This package adds the three folders
+to its search path, so every module in them can be imported from here:
+
+    import cse212
+    tree = cse212.BalancedBST()
+
+    from cse212.linked_list import LinkedList
+    from cse212 import hi_lo_game
+
+Run Python from the Final Project folder (or add that folder to
+PYTHONPATH) so that Python can find the package.
+
+Importing the package does no work at all: each module is only loaded
+the first time one of its names is used, and no module runs its test
+cases unless it is run directly.  NumPy is only imported by
+hi_lo_simulation (and by CompactBST.search_many when it is called).
+
+Every module can also still be run on its own from its folder (python
+bst_solution.py).  That is why the modules that use a sibling import it
+in two ways:
+
+    if __package__:
+        from .bst_solution import BST   # loaded through this package
+    else:
+        from bst_solution import BST    # run from its own folder
+
+and why their test cases are in a main() function that only runs under
+if __name__ == "__main__".
+
+The demos and benchmarks can be run from the command line:
+
+    python -m cse212 --help
+
+"""
+import importlib
+import os
+
+# Search the three tutorial folders for the package's modules
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FOLDERS = ("stacks", "linked-lists", "binary-search-trees")
+__path__ += [os.path.join(_ROOT, folder) for folder in FOLDERS]
+
+# The names that can be used as cse212.<name>, and the module each one is
+# loaded from.  (The functions hi_lo_game and lru_cache have the same
+# names as their modules, so use cse212.hi_lo_game.hi_lo_game and
+# cse212.lru_cache.lru_cache for those.)
+_EXPORTS = {
+    "BST": "bst_solution",
+    "BalancedBST": "bst_solution",
+    "create_bst_from_sorted_list": "bst_solution",
+    "merge_sorted_into_bst": "bst_solution",
+    "merge_trees": "bst_solution",
+    "union_trees": "bst_solution",
+    "intersect_trees": "bst_solution",
+    "CompactBST": "bst_compact",
+    "MappedBST": "bst_compact",
+    "PersistentBST": "bst_persistent",
+    "MultisetBST": "bst_multiset",
+    "build_multiset": "bst_multiset",
+    "LinkedList": "linked_list",
+    "UnrolledLinkedList": "unrolled_linked_list",
+    "SkipList": "skip_list",
+    "BlockingLinkedList": "blocking_linked_list",
+    "LRUCache": "lru_cache",
+    "CacheInfo": "lru_cache",
+    "BufferStack": "hi_lo_game",
+    "reverse": "hi_lo_game",
+    "reverse_file": "hi_lo_game",
+    "play_hi_lo": "hi_lo_game",
+    "simulate": "hi_lo_simulation",
+    "outcome": "hi_lo_solver",
+    "HiLoTable": "hi_lo_solver",
+    "run_tournament": "hi_lo_tournament",
+    "standings": "hi_lo_tournament",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    # Load the module that holds 'name' the first time it is used
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module("." + _EXPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value # Later uses skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
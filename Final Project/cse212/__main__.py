@@ -0,0 +1,266 @@
+# Command line entry point:  python -m cse212 <command>
+
+"""
+Commands (run from the Final Project folder):
+
+    python -m cse212 demo [module ...]     Run the test cases of the modules
+                                           (all of them if none are named)
+    python -m cse212 bench [suite ...]     Run the benchmarks: bst,
+                                           linked-lists and/or stacks
+    python -m cse212 solve [--output FILE] Build the Hi Lo outcome table
+    python -m cse212 sweep [options]       Time every operation at sizes
+                                           from 10^3 to 10^7 (see sweep.py)
+    python -m cse212 profile [options]     Count the node visits, comparisons
+                                           and allocations of a fixed workload
+                                           (see instrument.py)
+    python -m cse212 check-imports         Check that every module imports
+                                           quickly and prints nothing
+
+check-imports imports each module in a fresh Python process and fails
+(exit status 1) if a module prints anything while it is imported, loads
+NumPy without needing it, or takes longer than the startup budget.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import cse212
+from cse212 import sweep
+
+
+# The modules whose test cases 'demo' runs, in tutorial order
+DEMOS = [
+    "hi_lo_game", "hi_lo_simulation", "hi_lo_solver", "hi_lo_tournament",
+    "linked_list", "unrolled_linked_list", "skip_list", "blocking_linked_list", "lru_cache",
+    "bst_solution", "bst_compact", "bst_persistent", "bst_multiset",
+]
+
+BENCHMARKS = {
+    "stacks": "stack_benchmark",
+    "linked-lists": "linked_list_benchmark",
+    "bst": "bst_benchmark",
+}
+
+# Modules that are allowed to import NumPy when they are imported
+NEEDS_NUMPY = {"hi_lo_simulation"}
+
+# Run in a fresh Python process to time one import and catch its output
+_PROBE = """
+import contextlib, io, json, sys, time
+output = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(output):
+    import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "output": output.getvalue(),
+                  "numpy": "numpy" in sys.modules}}))
+"""
+
+
+def load(name):
+    return importlib.import_module("cse212." + name)
+
+
+def demo(names):
+    for name in names or DEMOS:
+        print(f"\n########## {name} ##########")
+        try:
+            module = load(name)
+        except ModuleNotFoundError as error:
+            if error.name != "numpy":
+                raise
+            print(f"{name} skipped (NumPy is not installed)")
+            continue
+        module.main()
+    return 0
+
+
+def bench(suites):
+    for suite in suites or BENCHMARKS:
+        load(BENCHMARKS[suite]).main()
+    return 0
+
+
+def solve(output, workers):
+    load("hi_lo_solver").build_table(output, workers)
+    return 0
+
+
+def run_sweep(args, operations):
+    def progress(result):
+        print(f"{result['operation']:<26}{result['implementation']:<30}"
+              f"{result['distribution']:<13}{result['size']:>12,}{result['ns_per_item']:>12,.0f} ns",
+              file=sys.stderr)
+
+    results = sweep.run_sweep(operations, args.sizes,
+                              args.distributions, args.repeat, args.time_limit, progress)
+    sweep.report(results)
+    if args.output:
+        sweep.save_results(results, args.output)
+        print(f"\nSaved the results to {args.output}")
+    if not args.baseline:
+        return 0
+
+    regressions = sweep.compare(results, sweep.load_results(args.baseline), args.threshold)
+    if not regressions:
+        print(f"\nNo result is more than {args.threshold:.0%} slower than {args.baseline}")
+        return 0
+    print(f"\n{len(regressions)} result(s) are more than {args.threshold:.0%} slower than {args.baseline}:")
+    for regression in regressions:
+        print(f"{regression.operation:<26}{regression.implementation:<30}"
+              f"{regression.distribution:<13}{regression.size:>12,}"
+              f"{regression.baseline_ns:>12,.0f} ns ->{regression.current_ns:>10,.0f} ns"
+              f"  ({regression.ratio:.2f}x)")
+    return 1
+
+
+def profile(size, sample_every, output, compare):
+    from cse212 import instrument
+    with instrument.instrument(sample_every) as profiler:
+        instrument.standard_workload(size)
+    profiler.report()
+    if output:
+        profiler.save(output)
+        print(f"\nSaved the profile to {output}")
+    if compare:
+        print(f"\nChanges from {compare}:")
+        instrument.print_diff(instrument.diff_profiles(instrument.load_profile(compare),
+                                                       profiler.operations))
+    return 0
+
+
+def all_modules():
+    # Every module in the package and the tutorial folders
+    modules = ["cse212"]
+    here = os.path.dirname(os.path.abspath(__file__))
+    for folder in [here] + [os.path.join(cse212._ROOT, folder) for folder in cse212.FOLDERS]:
+        for file_name in sorted(os.listdir(folder)):
+            if file_name.endswith(".py") and not file_name.startswith("__"):
+                modules.append("cse212." + file_name[:-3])
+    return modules
+
+
+def time_import(module, repeat):
+    # Import 'module' in 'repeat' fresh processes and keep the fastest run
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)],
+                                cwd=cse212._ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1]}
+        probe = json.loads(result.stdout)
+        if best is None or probe["seconds"] < best["seconds"]:
+            best = probe
+    return best
+
+
+def check_imports(budget, repeat):
+    failures = 0
+    print(f"{'module':<36}{'import time':>12}")
+    for module in all_modules():
+        name = module.rpartition(".")[2]
+        probe = time_import(module, repeat)
+        problems = []
+        if "error" in probe:
+            if name in NEEDS_NUMPY and "numpy" in probe["error"]:
+                print(f"{module:<36}{'skipped':>12}  (NumPy is not installed)")
+                continue
+            problems.append(probe["error"])
+        else:
+            if probe["output"]:
+                problems.append("printed while importing")
+            if probe["numpy"] and name not in NEEDS_NUMPY:
+                problems.append("imported NumPy")
+            # A module that needs NumPy is not held to the budget
+            if probe["seconds"] > budget and name not in NEEDS_NUMPY:
+                problems.append(f"over the {budget * 1000:.0f} ms budget")
+        seconds = probe.get("seconds")
+        shown = f"{seconds * 1000:.1f} ms" if seconds is not None else "-"
+        print(f"{module:<36}{shown:>12}  {'; '.join(problems) or 'ok'}")
+        failures += bool(problems)
+
+    if failures:
+        print(f"\n{failures} module(s) failed the import check")
+        return 1
+    print("\nEvery module passed the import check")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cse212",
+                                     description="Run the tutorial demos and benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    demo_parser = commands.add_parser("demo", help="run the test cases of the modules")
+    demo_parser.add_argument("modules", nargs="*", metavar="module",
+                             help="one of: " + ", ".join(DEMOS))
+
+    bench_parser = commands.add_parser("bench", help="run the benchmarks")
+    bench_parser.add_argument("suites", nargs="*", metavar="suite",
+                              help="one of: " + ", ".join(BENCHMARKS))
+
+    solve_parser = commands.add_parser("solve", help="build the Hi Lo outcome table")
+    solve_parser.add_argument("--output", default="hi_lo_table.bin")
+    solve_parser.add_argument("--workers", type=int, default=None)
+
+    sweep_parser = commands.add_parser("sweep", help="time every operation at many sizes")
+    sweep_parser.add_argument("operations", nargs="*", metavar="operation",
+                              help="operations to time, such as bst.insert or just bst "
+                                   "(all of them by default)")
+    sweep_parser.add_argument("--sizes", type=int, nargs="+", default=sweep.SIZES)
+    sweep_parser.add_argument("--distributions", nargs="+", default=sweep.DISTRIBUTIONS,
+                              choices=sweep.DISTRIBUTIONS)
+    sweep_parser.add_argument("--repeat", type=int, default=3,
+                              help="time each case this many times and keep the fastest")
+    sweep_parser.add_argument("--time-limit", type=float, default=10.0,
+                              help="skip sizes predicted to take more seconds than this")
+    sweep_parser.add_argument("--output", help="save the results to this JSON file")
+    sweep_parser.add_argument("--baseline", help="compare with the results in this JSON file "
+                                                 "and fail on a regression")
+    sweep_parser.add_argument("--threshold", type=float, default=0.25,
+                              help="how much slower counts as a regression (default 0.25)")
+
+    profile_parser = commands.add_parser("profile",
+                                         help="count what each operation does in a fixed workload")
+    profile_parser.add_argument("--size", type=int, default=2000,
+                                help="how many keys the workload uses (default 2000)")
+    profile_parser.add_argument("--sample-every", type=int, default=16,
+                                help="time every Nth call of each operation (default 16)")
+    profile_parser.add_argument("--output", help="save the profile to this JSON file")
+    profile_parser.add_argument("--compare", help="show the changes from the profile in this JSON file")
+
+    check_parser = commands.add_parser("check-imports",
+                                       help="check that importing every module is quick and quiet")
+    check_parser.add_argument("--budget", type=float, default=0.1,
+                              help="the most seconds one import may take (default 0.1)")
+    check_parser.add_argument("--repeat", type=int, default=3,
+                              help="time each import this many times and keep the fastest")
+
+    args = parser.parse_args(argv)
+    # (argparse 'choices' cannot be combined with an empty nargs="*" list)
+    unknown = [name for name in getattr(args, "modules", []) if name not in DEMOS]
+    unknown += [name for name in getattr(args, "suites", []) if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown name: " + ", ".join(unknown))
+    if args.command == "demo":
+        return demo(args.modules)
+    if args.command == "bench":
+        return bench(args.suites)
+    if args.command == "solve":
+        return solve(args.output, args.workers)
+    if args.command == "sweep":
+        try:
+            operations = sweep.select_operations(args.operations)
+        except ValueError as error:
+            parser.error(str(error))
+        return run_sweep(args, operations)
+    if args.command == "profile":
+        return profile(args.size, args.sample_every, args.output, args.compare)
+    return check_imports(args.budget, args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
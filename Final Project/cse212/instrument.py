@@ -0,0 +1,410 @@
+# Opt-in instrumentation for the LinkedList and BST classes
+
+"""
+When a tree or a list is slow, the time alone does not say why.  A plain
+BST built from sorted keys is slow because it turned into a chain (every
+search visits every node), a tree of long strings is slow because each
+comparison is slow, and a tree that is only inserted into is slow because
+of all the new nodes.  The Profiler counts what each operation did:
+
+    visits       nodes whose data was read
+    comparisons  comparisons between the key being searched for and the
+                 data in the structure
+    allocations  new nodes created
+    max depth    the most nodes visited by a single call (how far down
+                 the tree, or along the list, one search went)
+
+It also times every 'sample_every'-th call of each operation and keeps a
+histogram of those latencies (in power of two buckets of nanoseconds).
+
+Nothing in bst_solution.py or linked_list.py knows about any of this, so
+there is no cost at all when the Profiler is not running.  While it runs,
+the methods of the classes are replaced with versions that count, and
+the original methods are put back when it stops:
+
+    with instrument() as profile:
+        tree.insert(5)
+        5 in tree
+    profile.report()
+    print(profile.operations["BalancedBST.insert"].comparisons)
+
+To count comparisons, the key given to an operation such as insert(data)
+or remove(value) is wrapped in a _Probe object for the length of the call.
+The probe compares like the key and counts every comparison.  (The probe
+is unwrapped before it can be stored in a new node.)  Nodes are counted
+as visited when their 'data' is read.
+
+The latencies include the time spent counting, so they are for comparing
+one profile against another, not against an uninstrumented run.  A
+profile can be saved as JSON and compared with diff_profiles, for example
+before and after a change:
+
+    python -m cse212 profile --output before.json
+    ... make a change ...
+    python -m cse212 profile --compare before.json
+
+Only one Profiler can run at a time, and it is not meant to be used
+while other threads are changing the structures.
+"""
+import json
+import operator
+import random
+import sys
+import time
+
+from .bst_multiset import MultisetBST
+from .bst_persistent import PersistentBST
+from .bst_solution import BST, BalancedBST
+from .linked_list import LinkedList
+
+
+# The methods that are instrumented, for each class.  The number is the
+# position of the argument holding the key that is searched for (which is
+# wrapped to count comparisons), or None if the method has no such key.
+# Only methods defined in the class itself are listed, so each subclass
+# that overrides a method has its own entry.
+METHODS = {
+    BST: {
+        "insert": 0, "delete": 0, "contains": 0, "floor": 0, "ceiling": 0,
+        "rank": 0, "select": None, "get_height": None,
+    },
+    PersistentBST: {"insert": 0, "delete": 0},
+    MultisetBST: {"insert": 0, "count": 0, "remove": 0, "delete": 0},
+    LinkedList: {
+        "insert_head": None, "insert_tail": None, "insert_after": 0,
+        "remove_head": None, "remove_tail": None, "pop_head": None, "pop_tail": None,
+        "remove": 0, "replace": 0, "__contains__": 0, "extend": None, "remove_if": None,
+    },
+}
+
+# The node classes whose allocations and visits are counted
+NODE_CLASSES = (BST.Node, LinkedList.Node)
+
+_active = None # The Profiler that is running, if any
+
+
+class _Call:
+    # The counts for one call of an instrumented method
+    __slots__ = ("visits", "comparisons", "allocations", "last_node")
+
+    def __init__(self):
+        self.visits = 0
+        self.comparisons = 0
+        self.allocations = 0
+        self.last_node = None
+
+
+def _counting(compare):
+    # Make a comparison method for _Probe that counts each comparison
+    def method(self, other):
+        self.call.comparisons += 1
+        return compare(self.value, other)
+    return method
+
+
+class _Probe:
+    # A key that compares (and hashes) like 'value' and counts comparisons.
+    # Python tries the reflected method when the key is on the right
+    # (for example node.data < key), so those are counted too.
+    __slots__ = ("value", "call")
+
+    def __init__(self, value, call):
+        self.value = value
+        self.call = call
+
+    __eq__ = _counting(operator.eq)
+    __ne__ = _counting(operator.ne)
+    __lt__ = _counting(operator.lt)
+    __le__ = _counting(operator.le)
+    __gt__ = _counting(operator.gt)
+    __ge__ = _counting(operator.ge)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+class OperationStats:
+    # The totals for one operation, such as "BalancedBST.insert"
+
+    def __init__(self):
+        self.calls = 0
+        self.visits = 0
+        self.comparisons = 0
+        self.allocations = 0
+        self.max_depth = 0
+        self.samples = 0
+        self.histogram = {} # bucket (upper bound in ns) -> number of samples
+
+    def add(self, call, nanoseconds=None):
+        self.visits += call.visits
+        self.comparisons += call.comparisons
+        self.allocations += call.allocations
+        self.max_depth = max(self.max_depth, call.visits)
+        if nanoseconds is not None:
+            # A call of 300 ns goes in the 512 ns bucket
+            bucket = 1 << max(nanoseconds, 1).bit_length()
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+            self.samples += 1
+
+    def per_call(self, name):
+        # The average of the count 'name' ("visits", ...) for one call
+        return getattr(self, name) / self.calls if self.calls else 0.0
+
+    def percentile(self, percent):
+        # The bucket that the 'percent'-th percentile latency falls in
+        # (an upper bound in ns), or None if there are no samples
+        remaining = self.samples * percent / 100
+        for bucket in sorted(self.histogram):
+            remaining -= self.histogram[bucket]
+            if remaining <= 0:
+                return bucket
+        return None
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "visits": self.visits,
+            "comparisons": self.comparisons,
+            "allocations": self.allocations,
+            "max_depth": self.max_depth,
+            "samples": self.samples,
+            "histogram": {str(bucket): count for bucket, count in sorted(self.histogram.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, values):
+        stats = cls()
+        for name in ("calls", "visits", "comparisons", "allocations", "max_depth", "samples"):
+            setattr(stats, name, values[name])
+        stats.histogram = {int(bucket): count for bucket, count in values["histogram"].items()}
+        return stats
+
+
+class Profiler:
+    """
+    Counts what the instrumented methods do while it is enabled.  The
+    totals are in 'operations', a dictionary of OperationStats by name
+    ("ClassName.method", using the class of the object the method was
+    called on).  'sample_every' sets how often a call is timed: 1 times
+    every call, 16 times every 16th call of each operation.
+    """
+
+    def __init__(self, sample_every=16):
+        self.sample_every = sample_every
+        self.operations = {}
+        # Nodes created outside an instrumented call (for example by
+        # create_bst_from_sorted_list)
+        self.outside_allocations = 0
+        self.call = None # The _Call of the instrumented call in progress
+        self.saved = []  # (class, name, original or None) to restore
+
+    def enable(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("another Profiler is already running")
+        _active = self
+        for cls, methods in METHODS.items():
+            for name, key_position in methods.items():
+                self._replace(cls, name, self._wrap(cls.__dict__[name], name, key_position))
+        for node_class in NODE_CLASSES:
+            self._replace(node_class, "__init__", self._wrap_init(node_class.__init__))
+            self._replace(node_class, "__getattribute__", self._node_getattribute)
+
+    def disable(self):
+        global _active
+        # Put the original methods back, last replaced first
+        while self.saved:
+            cls, name, original = self.saved.pop()
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        _active = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _replace(self, cls, name, replacement):
+        self.saved.append((cls, name, cls.__dict__.get(name)))
+        setattr(cls, name, replacement)
+
+    def stats(self, name):
+        # The OperationStats for 'name', created the first time it is used
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        return stats
+
+    def _wrap(self, method, name, key_position):
+        # Return a version of 'method' that counts its calls
+        profiler = self
+
+        def instrumented(obj, *args, **kwargs):
+            if profiler.call is not None:
+                # Called from another instrumented method (such as
+                # __contains__ calling contains), so it counts as part of it
+                return method(obj, *args, **kwargs)
+            call = profiler.call = _Call()
+            if key_position is not None and key_position < len(args):
+                args = list(args)
+                args[key_position] = _Probe(args[key_position], call)
+            stats = profiler.stats(type(obj).__name__ + "." + name)
+            stats.calls += 1
+            nanoseconds = None
+            try:
+                if stats.calls % profiler.sample_every == 0:
+                    start = time.perf_counter_ns()
+                    result = method(obj, *args, **kwargs)
+                    nanoseconds = time.perf_counter_ns() - start
+                else:
+                    result = method(obj, *args, **kwargs)
+            finally:
+                profiler.call = None
+                stats.add(call, nanoseconds)
+            return result
+
+        instrumented.__name__ = method.__name__
+        instrumented.__doc__ = method.__doc__
+        instrumented.__wrapped__ = method
+        return instrumented
+
+    def _wrap_init(self, init):
+        # Return a node __init__ that counts the new node and makes sure
+        # that it never stores a _Probe
+        profiler = self
+
+        def instrumented_init(node, data, *args):
+            if type(data) is _Probe:
+                data = data.value
+            if profiler.call is not None:
+                profiler.call.allocations += 1
+            else:
+                profiler.outside_allocations += 1
+            init(node, data, *args)
+
+        return instrumented_init
+
+    @staticmethod
+    def _node_getattribute(node, name):
+        # Count a visit the first time a call reads the data of a node
+        if name == "data":
+            call = _active.call
+            if call is not None and node is not call.last_node:
+                call.visits += 1
+                call.last_node = node
+        return object.__getattribute__(node, name)
+
+    def to_dict(self):
+        return {
+            "sample_every": self.sample_every,
+            "outside_allocations": self.outside_allocations,
+            "operations": {name: stats.to_dict() for name, stats in sorted(self.operations.items())},
+        }
+
+    def save(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=1)
+            file.write("\n")
+
+    def report(self, file=sys.stdout):
+        print(f"{'operation':<28}{'calls':>9}{'visits':>10}{'compares':>10}{'allocs':>8}"
+              f"{'max depth':>11}{'p50 ns':>9}{'p99 ns':>9}", file=file)
+        print(f"{'':<28}{'':>9}{'(per call)':>28}", file=file)
+        for name, stats in sorted(self.operations.items()):
+            p50 = stats.percentile(50)
+            p99 = stats.percentile(99)
+            print(f"{name:<28}{stats.calls:>9,}{stats.per_call('visits'):>10.1f}"
+                  f"{stats.per_call('comparisons'):>10.1f}{stats.per_call('allocations'):>8.2f}"
+                  f"{stats.max_depth:>11,}{p50 or '-':>9}{p99 or '-':>9}", file=file)
+        if self.outside_allocations:
+            print(f"Nodes created outside these operations: {self.outside_allocations:,}", file=file)
+
+
+def instrument(sample_every=16):
+    # Return a Profiler to use in a 'with' statement
+    return Profiler(sample_every)
+
+
+def load_profile(path):
+    # Read a profile saved by Profiler.save as {name: OperationStats}
+    with open(path) as file:
+        saved = json.load(file)
+    return {name: OperationStats.from_dict(values) for name, values in saved["operations"].items()}
+
+
+# The numbers compared by diff_profiles, as (label, function of the stats)
+DIFF_METRICS = [
+    ("visits/call", lambda stats: stats.per_call("visits")),
+    ("comparisons/call", lambda stats: stats.per_call("comparisons")),
+    ("allocations/call", lambda stats: stats.per_call("allocations")),
+    ("max depth", lambda stats: stats.max_depth),
+    ("p50 ns", lambda stats: stats.percentile(50)),
+    ("p99 ns", lambda stats: stats.percentile(99)),
+]
+
+
+def diff_profiles(old, new):
+    """
+    Compare two profiles ({name: OperationStats}, as returned by
+    load_profile or Profiler.operations) and return a list of
+    (operation, metric, old value, new value) for every number that
+    changed.  Operations only in one profile are compared with None.
+    """
+    changes = []
+    for name in sorted(set(old) | set(new)):
+        for label, metric in DIFF_METRICS:
+            before = metric(old[name]) if name in old else None
+            after = metric(new[name]) if name in new else None
+            if before != after:
+                changes.append((name, label, before, after))
+    return changes
+
+
+def print_diff(changes, file=sys.stdout):
+    if not changes:
+        print("The profiles are the same", file=file)
+        return
+    print(f"{'operation':<28}{'metric':<18}{'old':>12}{'new':>12}{'change':>10}", file=file)
+    for name, label, before, after in changes:
+        change = f"{(after - before) / before:+.0%}" if before and after is not None else ""
+        before = "-" if before is None else f"{before:,.1f}"
+        after = "-" if after is None else f"{after:,.1f}"
+        print(f"{name:<28}{label:<18}{before:>12}{after:>12}{change:>10}", file=file)
+
+
+def standard_workload(size=2000, seed=212):
+    """
+    A fixed mix of operations on each instrumented class, for profiles
+    that can be compared between builds: 'size' keys are inserted in
+    random and in sorted order, looked up and deleted again.  Run it
+    inside a Profiler.
+    """
+    keys = list(range(size))
+    random.Random(seed).shuffle(keys)
+    for tree_class in (BST, BalancedBST, PersistentBST):
+        for order in (keys, sorted(keys)):
+            tree = tree_class()
+            for key in order:
+                tree.insert(key)
+            for key in keys:
+                tree.contains(key)
+                tree.floor(key + 0.5)
+            tree.get_height()
+            for key in keys[: size // 2]:
+                tree.delete(key)
+    for indexed in (False, True):
+        linked_list = LinkedList(indexed)
+        linked_list.extend(keys)
+        for key in keys[: size // 4]:
+            linked_list.insert_after(key, -key)
+            key in linked_list
+            linked_list.remove(key)
+        while len(linked_list) > 0:
+            linked_list.pop_head()
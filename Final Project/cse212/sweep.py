@@ -0,0 +1,504 @@
+# Scaling benchmarks for the stack, linked list and BST operations
+
+"""
+The *_benchmark.py files in each folder each answer one question.  This
+module times every main operation of the data structures at many sizes
+(1,000 up to 10,000,000 items) so that a change can be checked for speed
+the same way the test cases check it for correctness.
+
+Every operation is timed for each of its implementations, next to the
+Python built-ins that do the same job (list, collections.deque, bisect
+and dict).  Those reference rows show when a custom structure is worth
+using.  Each run does one operation per input value, and the results are
+reported in nanoseconds per item, so a flat row means the operation is
+O(1) (or O(log n)) and a row that grows tenfold per column is O(n).
+
+The input values are 0 .. n-1 in one of three orders:
+
+    sorted       in increasing order
+    random       shuffled (the same shuffle every run)
+    adversarial  zigzag: 0, n-1, 1, n-2, 2, ...  Every new key lands next
+                 to the last one, on alternating sides, which turns a plain
+                 BST into a chain and keeps the linked list searches long
+
+Sizes that would take too long are skipped: after each size, the time of
+the next size is predicted from how fast the time has been growing, and
+the sweep of that implementation stops if the prediction is over the
+time limit.  (This is what stops the O(n^2) cases early.)
+
+Results are saved as JSON.  compare() matches a run against a saved
+baseline and returns every result that got slower by more than the
+threshold, so a command line run can fail on a regression:
+
+    python -m cse212 sweep --output baseline.json
+    ... make a change ...
+    python -m cse212 sweep --baseline baseline.json
+
+"""
+import bisect
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+from collections import deque, namedtuple
+
+from .bst_compact import CompactBST
+from .bst_persistent import PersistentBST
+from .bst_solution import BST, BalancedBST, create_bst_from_sorted_list
+from .hi_lo_game import BufferStack, createStack, pop, push, reverse
+from .linked_list import LinkedList
+from .skip_list import SkipList
+from .unrolled_linked_list import UnrolledLinkedList
+
+
+SIZES = [10 ** exponent for exponent in range(3, 8)]
+DISTRIBUTIONS = ("sorted", "random", "adversarial")
+
+# An implementation of an operation.  'prepare' is given the input values,
+# builds whatever has to exist before the timing starts, and returns a
+# function that does the timed work (one operation per value).
+Case = namedtuple("Case", "name prepare reference")
+
+# 'key' is the short name used on the command line, such as "bst.insert".
+# 'distributions' are the input orders that matter for the operation.
+Operation = namedtuple("Operation", "key title distributions cases")
+
+
+def make_values(size, distribution, seed=212):
+    # Return the input values 0 .. size-1 in the order 'distribution'
+    if distribution == "sorted":
+        return list(range(size))
+    if distribution == "random":
+        values = list(range(size))
+        random.Random(seed).shuffle(values)
+        return values
+    if distribution == "adversarial":
+        values = []
+        low, high = 0, size - 1
+        while low <= high:
+            values.append(low)
+            if low != high:
+                values.append(high)
+            low += 1
+            high -= 1
+        return values
+    raise ValueError(f"unknown distribution {distribution!r}")
+
+
+
+##########################################
+# Building blocks for the timed functions
+##########################################
+
+# Every implementation is called the same way (one function call per
+# value), so the call overhead is the same in every row of a table.
+
+def _adding(make, add):
+    # Time add(structure, value) for every value, starting from make()
+    def prepare(values):
+        def run():
+            structure = make()
+            for value in values:
+                add(structure, value)
+        return run
+    return prepare
+
+
+def _probing(build, probe):
+    # Time probe(structure, value) for every value.  The structure is
+    # built from the values in sorted order before the timing starts, so
+    # the order of the probes is the only thing that changes.
+    def prepare(values):
+        structure = build(sorted(values))
+        def run():
+            for value in values:
+                probe(structure, value)
+        return run
+    return prepare
+
+
+def _removing(build, remove):
+    # Time remove(structure) once per value
+    def prepare(values):
+        structure = build(values)
+        def run():
+            for _ in values:
+                remove(structure)
+        return run
+    return prepare
+
+
+def _building(build):
+    # Time build(values)
+    def prepare(values):
+        return lambda: build(values)
+    return prepare
+
+
+def _iterating(build):
+    # Time one pass over a structure built before the timing starts
+    def prepare(values):
+        structure = build(sorted(values))
+        def run():
+            for _ in structure:
+                pass
+        return run
+    return prepare
+
+
+def _push_pop(make):
+    # Time pushing every value and popping them all off again
+    def prepare(values):
+        def run():
+            stack = make()
+            for value in values:
+                stack.append(value)
+            for _ in values:
+                stack.pop()
+        return run
+    return prepare
+
+
+def _stack_functions(values):
+    # The same as _push_pop, with the stack functions from hi_lo_game.py
+    def run():
+        stack = createStack()
+        for value in values:
+            push(stack, value)
+        for _ in values:
+            pop(stack)
+    return run
+
+
+def _reversing(reverse_text):
+    def prepare(values):
+        text = "".join(chr(0x21 + value % 0x5E) for value in values)
+        return lambda: reverse_text(text)
+    return prepare
+
+
+def _fill(structure, values, add):
+    for value in values:
+        add(structure, value)
+    return structure
+
+
+def _linked_list(values):
+    return _fill(LinkedList(), values, LinkedList.insert_tail)
+
+
+def _indexed_list(values):
+    return _fill(LinkedList(indexed=True), values, LinkedList.insert_tail)
+
+
+def _unrolled_list(values):
+    return _fill(UnrolledLinkedList(), values, UnrolledLinkedList.insert_tail)
+
+
+def _skip_list(values):
+    return _fill(SkipList(seed=212), values, SkipList.insert)
+
+
+def _balanced_bst(values):
+    return create_bst_from_sorted_list(values, BalancedBST)
+
+
+def _contains(structure, value):
+    return value in structure
+
+
+def _dict_set(table, value):
+    table[value] = True
+
+
+def _dict_delete(table, value):
+    del table[value]
+
+
+def _list_insert_after(items, value):
+    items.insert(items.index(value) + 1, -value)
+
+
+def _insert_after(structure, value):
+    structure.insert_after(value, -value)
+
+
+def _bisect_contains(items, value):
+    i = bisect.bisect_left(items, value)
+    return i < len(items) and items[i] == value
+
+
+def _bisect_floor(items, value):
+    i = bisect.bisect_right(items, value)
+    return items[i - 1] if i else None
+
+
+def _bisect_delete(items, value):
+    del items[bisect.bisect_left(items, value)]
+
+
+##########################################
+# The operations
+##########################################
+
+OPERATIONS = [
+    Operation("stack.push_pop", "push every item, then pop them all", ("random",), [
+        Case("stack functions", _stack_functions, False),
+        Case("BufferStack", _push_pop(lambda: BufferStack("q")), False),
+        Case("list", _push_pop(list), True),
+        Case("deque", _push_pop(deque), True),
+    ]),
+    Operation("stack.reverse", "reverse a string", ("random",), [
+        Case("reverse", _reversing(reverse), False),
+        Case("str[::-1]", _reversing(lambda text: text[::-1]), True),
+    ]),
+    Operation("linked_list.append", "insert at the tail", ("random",), [
+        Case("LinkedList", _adding(LinkedList, LinkedList.insert_tail), False),
+        Case("LinkedList indexed", _adding(lambda: LinkedList(indexed=True), LinkedList.insert_tail), False),
+        Case("UnrolledLinkedList", _adding(UnrolledLinkedList, UnrolledLinkedList.insert_tail), False),
+        Case("list.append", _adding(list, list.append), True),
+        Case("deque.append", _adding(deque, deque.append), True),
+    ]),
+    Operation("linked_list.prepend", "insert at the head", ("random",), [
+        Case("LinkedList", _adding(LinkedList, LinkedList.insert_head), False),
+        Case("UnrolledLinkedList", _adding(UnrolledLinkedList, UnrolledLinkedList.insert_head), False),
+        Case("list.insert(0)", _adding(list, lambda items, value: items.insert(0, value)), True),
+        Case("deque.appendleft", _adding(deque, deque.appendleft), True),
+    ]),
+    Operation("linked_list.pop_head", "remove from the head", ("random",), [
+        Case("LinkedList", _removing(_linked_list, LinkedList.pop_head), False),
+        Case("UnrolledLinkedList", _removing(_unrolled_list, UnrolledLinkedList.remove_head), False),
+        Case("list.pop(0)", _removing(list, lambda items: items.pop(0)), True),
+        Case("deque.popleft", _removing(deque, deque.popleft), True),
+    ]),
+    Operation("linked_list.insert_after", "insert after a value", DISTRIBUTIONS, [
+        Case("LinkedList", _probing(_linked_list, _insert_after), False),
+        Case("LinkedList indexed", _probing(_indexed_list, _insert_after), False),
+        Case("UnrolledLinkedList", _probing(_unrolled_list, _insert_after), False),
+        Case("list.index + insert", _probing(list, _list_insert_after), True),
+    ]),
+    Operation("linked_list.contains", "check if a value is in the list", DISTRIBUTIONS, [
+        Case("LinkedList", _probing(_linked_list, _contains), False),
+        Case("LinkedList indexed", _probing(_indexed_list, _contains), False),
+        Case("UnrolledLinkedList", _probing(_unrolled_list, _contains), False),
+        Case("SkipList", _probing(_skip_list, _contains), False),
+        Case("list", _probing(list, _contains), True),
+        Case("dict", _probing(dict.fromkeys, _contains), True),
+    ]),
+    Operation("linked_list.remove", "remove a value", DISTRIBUTIONS, [
+        Case("LinkedList", _probing(_linked_list, LinkedList.remove), False),
+        Case("LinkedList indexed", _probing(_indexed_list, LinkedList.remove), False),
+        Case("UnrolledLinkedList", _probing(_unrolled_list, UnrolledLinkedList.remove), False),
+        Case("SkipList", _probing(_skip_list, SkipList.remove), False),
+        Case("list.remove", _probing(list, list.remove), True),
+        Case("dict", _probing(dict.fromkeys, _dict_delete), True),
+    ]),
+    Operation("linked_list.sorted_insert", "insert in sorted order", DISTRIBUTIONS, [
+        Case("SkipList", _adding(lambda: SkipList(seed=212), SkipList.insert), False),
+        Case("bisect.insort", _adding(list, bisect.insort), True),
+    ]),
+    Operation("linked_list.iterate", "iterate over every value", ("sorted",), [
+        Case("LinkedList", _iterating(_linked_list), False),
+        Case("UnrolledLinkedList", _iterating(_unrolled_list), False),
+        Case("SkipList", _iterating(_skip_list), False),
+        Case("list", _iterating(list), True),
+        Case("deque", _iterating(deque), True),
+    ]),
+    Operation("bst.insert", "insert a key", DISTRIBUTIONS, [
+        Case("BST", _adding(BST, BST.insert), False),
+        Case("BalancedBST", _adding(BalancedBST, BalancedBST.insert), False),
+        Case("PersistentBST", _adding(PersistentBST, PersistentBST.insert), False),
+        Case("bisect.insort", _adding(list, bisect.insort), True),
+        Case("dict", _adding(dict, _dict_set), True),
+    ]),
+    Operation("bst.contains", "search for a key", DISTRIBUTIONS, [
+        Case("BST", _probing(create_bst_from_sorted_list, _contains), False),
+        Case("CompactBST", _probing(CompactBST, _contains), False),
+        Case("bisect", _probing(list, _bisect_contains), True),
+        Case("dict", _probing(dict.fromkeys, _contains), True),
+    ]),
+    Operation("bst.floor", "find the largest key <= a value", DISTRIBUTIONS, [
+        Case("BST", _probing(create_bst_from_sorted_list, BST.floor), False),
+        Case("bisect", _probing(list, _bisect_floor), True),
+    ]),
+    Operation("bst.delete", "delete a key", DISTRIBUTIONS, [
+        Case("BST", _probing(create_bst_from_sorted_list, BST.delete), False),
+        Case("BalancedBST", _probing(_balanced_bst, BalancedBST.delete), False),
+        Case("bisect + del", _probing(list, _bisect_delete), True),
+        Case("dict", _probing(dict.fromkeys, _dict_delete), True),
+    ]),
+    Operation("bst.bulk_build", "sort the keys, then build", DISTRIBUTIONS, [
+        Case("create_bst_from_sorted_list", _building(
+            lambda values: create_bst_from_sorted_list(sorted(values))), False),
+        Case("CompactBST", _building(lambda values: CompactBST(sorted(values))), False),
+        Case("sorted", _building(sorted), True),
+        Case("dict.fromkeys", _building(dict.fromkeys), True),
+    ]),
+    Operation("bst.scan", "visit every key in order", ("sorted",), [
+        Case("BST", _iterating(create_bst_from_sorted_list), False),
+        Case("BST.range", _iterating(
+            lambda values: create_bst_from_sorted_list(values).range(values[0], values[-1])), False),
+        Case("CompactBST", _iterating(CompactBST), False),
+        Case("list", _iterating(list), True),
+    ]),
+]
+
+
+def select_operations(keys=None):
+    # Return the operations whose key is in 'keys' or starts with one of
+    # them followed by a dot ("bst" selects every bst.* operation)
+    if not keys:
+        return list(OPERATIONS)
+    selected = [operation for operation in OPERATIONS
+                if any(operation.key == key or operation.key.startswith(key + ".")
+                       for key in keys)]
+    if not selected:
+        raise ValueError("no operation matches " + ", ".join(keys))
+    return selected
+
+
+##########################################
+# Running, saving and comparing sweeps
+##########################################
+
+def time_case(case, values, repeat=3):
+    """
+    Return the fastest of 'repeat' timings of 'case' on 'values', in
+    seconds.  Every timing starts from a freshly prepared structure (the
+    timed work may change it), and the garbage collector is paused while
+    timing, like the timeit module does.  A run that takes over a second
+    is not repeated.
+    """
+    best = math.inf
+    for _ in range(repeat):
+        run = case.prepare(values)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+        finally:
+            gc.enable()
+        del run
+        best = min(best, seconds)
+        if seconds > 1:
+            break
+    return best
+
+
+def _predict(timings, next_size):
+    # Predict the seconds for 'next_size' from the (size, seconds) timings
+    # so far.  The growth rate of the last two sizes is used (assuming at
+    # least O(n) growth).
+    size, seconds = timings[-1]
+    growth = 1.0
+    if len(timings) > 1:
+        previous_size, previous_seconds = timings[-2]
+        if previous_seconds > 0 and seconds > 0:
+            growth = max(1.0, math.log(seconds / previous_seconds) / math.log(size / previous_size))
+    return seconds * (next_size / size) ** growth
+
+
+def run_sweep(operations=None, sizes=SIZES, distributions=DISTRIBUTIONS,
+              repeat=3, time_limit=10.0, progress=None):
+    """
+    Time every case of every operation (all of OPERATIONS by default) at
+    every size and input order, and return the results as a dictionary
+    ready to be saved with save_results.  An implementation's larger
+    sizes are skipped once one is predicted to take over 'time_limit'
+    seconds.  'progress', if given, is called with each result.
+    """
+    results = []
+    for operation in operations or OPERATIONS:
+        for distribution in operation.distributions:
+            if distribution not in distributions:
+                continue
+            for case in operation.cases:
+                timings = []
+                for size in sorted(sizes):
+                    if timings and _predict(timings, size) > time_limit:
+                        break
+                    values = make_values(size, distribution)
+                    seconds = time_case(case, values, repeat)
+                    timings.append((size, seconds))
+                    result = {
+                        "operation": operation.key,
+                        "implementation": case.name,
+                        "reference": case.reference,
+                        "distribution": distribution,
+                        "size": size,
+                        "seconds": seconds,
+                        "ns_per_item": seconds * 1e9 / size,
+                    }
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save_results(sweep, path):
+    with open(path, "w") as file:
+        json.dump(sweep, file, indent=1)
+        file.write("\n")
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def _key(result):
+    return result["operation"], result["implementation"], result["distribution"], result["size"]
+
+
+Regression = namedtuple("Regression", "operation implementation distribution size "
+                                      "baseline_ns current_ns ratio")
+
+
+def compare(current, baseline, threshold=0.25, min_seconds=0.001):
+    """
+    Return a list of Regressions: the results in 'current' that are more
+    than 'threshold' (0.25 is 25%) slower per item than the same result
+    in 'baseline'.  Results missing from either sweep are not compared,
+    and neither are baseline results under 'min_seconds', which are too
+    short to time reliably.
+    """
+    before = {_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(_key(result))
+        if old is None or old["seconds"] < min_seconds:
+            continue
+        ratio = result["ns_per_item"] / old["ns_per_item"]
+        if ratio > 1 + threshold:
+            regressions.append(Regression(*_key(result), old["ns_per_item"],
+                                          result["ns_per_item"], ratio))
+    return regressions
+
+
+def report(sweep, file=sys.stdout):
+    # Print one table (nanoseconds per item) per operation and input order.
+    # Reference implementations are marked with '*'.
+    tables = {}
+    for result in sweep["results"]:
+        table = tables.setdefault((result["operation"], result["distribution"]), {})
+        name = result["implementation"] + (" *" if result["reference"] else "")
+        table.setdefault(name, {})[result["size"]] = result["ns_per_item"]
+
+    titles = {operation.key: operation.title for operation in OPERATIONS}
+    for (key, distribution), table in tables.items():
+        sizes = sorted({size for row in table.values() for size in row})
+        print(f"\n=========== {key} ({titles.get(key, key)}), {distribution} ===========", file=file)
+        print(f"{'ns per item':<30}" + "".join(f"{size:>13,}" for size in sizes), file=file)
+        for name, row in table.items():
+            cells = "".join(f"{row[size]:>13,.0f}" if size in row else f"{'-':>13}" for size in sizes)
+            print(f"{name:<30}{cells}", file=file)
@@ -0,0 +1,153 @@
+# A thread-safe, blocking linked list for producer/consumer work queues
+
+"""
+A LinkedList can be used as a queue between threads: producers call
+insert_tail and consumers take from the head.  But none of the LinkedList
+functions are atomic, so two threads changing the links at the same time
+can corrupt the list, and a consumer has no way to wait for work.
+
+BlockingLinkedList wraps a LinkedList with a lock and two conditions:
+
+1) pop_head and pop_tail wait (optionally with a timeout) until there is
+   a value to take, and return it.
+2) If 'capacity' is given, insert_head and insert_tail wait until there is
+   room, so fast producers are slowed down to the speed of the consumers
+   (backpressure).
+3) drain takes many values while holding the lock only once, which is
+   much cheaper than popping them one at a time.
+
+On a timeout, queue.Empty or queue.Full is raised, the same as queue.Queue.
+"""
+import threading
+import time
+from queue import Empty, Full
+
+if __package__:
+    from .linked_list import LinkedList
+else:
+    from linked_list import LinkedList
+
+
+class BlockingLinkedList:
+    # This class is a LinkedList that many threads can share safely
+
+    def __init__(self, capacity=None):
+        # 'capacity' is the most values the list may hold (None for no limit)
+        self.capacity = capacity
+        self.items = LinkedList()
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.items)
+
+    def insert_head(self, value, block=True, timeout=None):
+        # Add 'value' at the head, waiting for room if the list is full
+        with self.not_full:
+            if self.capacity is not None and len(self.items) >= self.capacity:
+                self._wait_for_room(block, timeout)
+            self.items.insert_head(value)
+            self.not_empty.notify()
+
+    def insert_tail(self, value, block=True, timeout=None):
+        # Add 'value' at the tail, waiting for room if the list is full
+        with self.not_full:
+            if self.capacity is not None and len(self.items) >= self.capacity:
+                self._wait_for_room(block, timeout)
+            self.items.insert_tail(value)
+            self.not_empty.notify()
+
+    def pop_head(self, block=True, timeout=None):
+        # Remove and return the value at the head, waiting for one if the
+        # list is empty
+        with self.not_empty:
+            if self.items.head is None:
+                self._wait_for_items(block, timeout)
+            value = self.items.pop_head()
+            self.not_full.notify()
+            return value
+
+    def pop_tail(self, block=True, timeout=None):
+        # Remove and return the value at the tail, waiting for one if the
+        # list is empty
+        with self.not_empty:
+            if self.items.head is None:
+                self._wait_for_items(block, timeout)
+            value = self.items.pop_tail()
+            self.not_full.notify()
+            return value
+
+    def drain(self, max_items=None, block=False, timeout=None):
+        """
+        Remove and return a list of up to 'max_items' values from the head
+        (all of them if 'max_items' is None), taking the lock only once.
+        If 'block' is True, wait until at least one value is available;
+        otherwise an empty list is returned when there is nothing to take.
+        """
+        with self.not_empty:
+            if block and self.items.head is None:
+                self._wait_for_items(True, timeout)
+            items = self.items
+            values = []
+            while items.head is not None and (max_items is None or len(values) < max_items):
+                values.append(items.pop_head())
+            if values:
+                self.not_full.notify(len(values))
+            return values
+
+    def _wait_for_room(self, block, timeout):
+        # Wait (with the lock held) until the list is below its capacity
+        self._wait(self.not_full, lambda: len(self.items) < self.capacity,
+                   block, timeout, Full)
+
+    def _wait_for_items(self, block, timeout):
+        # Wait (with the lock held) until the list has at least one value
+        self._wait(self.not_empty, lambda: self.items.head is not None,
+                   block, timeout, Empty)
+
+    @staticmethod
+    def _wait(condition, ready, block, timeout, error):
+        # Wait on 'condition' until ready() is true.  Raise 'error' if we
+        # may not block, or if 'timeout' seconds pass first.
+        if ready():
+            return
+        if not block:
+            raise error
+        if timeout is None:
+            while not ready():
+                condition.wait()
+            return
+        deadline = time.monotonic() + timeout
+        while not ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise error
+            condition.wait(remaining)
+
+
+def main():
+    # Test cases for the blocking linked list
+    queue1 = BlockingLinkedList(capacity=2)
+    queue1.insert_tail(1)
+    queue1.insert_tail(2)
+    try:
+        queue1.insert_tail(3, timeout=0.01)
+    except Full:
+        print("Full") # Full
+    print(queue1.pop_head(), queue1.pop_tail()) # 1 2
+    try:
+        queue1.pop_head(block=False)
+    except Empty:
+        print("Empty") # Empty
+
+    queue2 = BlockingLinkedList()
+    producer = threading.Thread(target=lambda: [queue2.insert_tail(x) for x in range(5)])
+    producer.start()
+    producer.join()
+    print(queue2.drain(3), queue2.drain()) # [0, 1, 2] [3, 4]
+
+
+if __name__ == "__main__":
+    main()
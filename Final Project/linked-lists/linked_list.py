@@ -1,20 +1,51 @@
+import json
+import pickle
+
+
 class LinkedList:
 
+    # The most values shown by str() and repr() (None to show them all)
+    preview_length = 1000
+
+    # The first bytes of a file written by dump(file, "binary")
+    _BINARY_MAGIC = b"LLST1\n"
+
     class Node:
+        # __slots__ stores the three attributes in fixed places instead of
+        # giving every node its own __dict__, which saves a lot of memory
+        # on long lists.
+        __slots__ = ("data", "next", "prev")
+
       # This function initializes the node object 
         def __init__(self, data):
             self.data = data # The node will contain data
             self.next = None # The pointer to next is initialized as null.
             self.prev = None # The pointer to prev is initialized as null.
           
-    def __init__(self):
+    def __init__(self, indexed=False):
         # This function initializes an empty linked list.
+        # If 'indexed' is True, a dictionary from each value to the nodes
+        # that hold it is kept up to date, so remove, insert_after, replace
+        # and 'in' can find their nodes without searching from the head.
+        # (A value that is in more than one node still has to be searched
+        # for, to find the node closest to the head.)  Values must be
+        # hashable to use the index.
         self.head = None
         self.tail = None
+        self.count = 0 # The number of nodes, so len() does not need to count them
+        self.index = {} if indexed else None
+
+    def __len__(self):
+        return self.count
+
     def insert_head(self, value):
         # This function will insert a new node at the head of the linked list.
+        # The new node is returned so it can be moved or removed later.
         # Create the new node
         new_node = LinkedList.Node(value)  
+        self.count += 1
+        if self.index is not None:
+            self._index_add(new_node)
         
         # If the list is empty, then point both head and tail
         # to the new node.
@@ -26,12 +57,17 @@ class LinkedList:
             new_node.next = self.head # Connect new node to the previous head
             self.head.prev = new_node # Connect the previous head to the new node
             self.head = new_node      # Set the head to equal the new node
+        return new_node
 
     def insert_tail(self, value):
         # Insert a new node at the tail end of the linked list.
+        # The new node is returned so it can be moved or removed later.
           
         # Create the new node
         new_node = LinkedList.Node(value)  
+        self.count += 1
+        if self.index is not None:
+            self._index_add(new_node)
         
         # If the list is empty, then point both tail and tail
         # to the new node.
@@ -43,31 +79,32 @@ class LinkedList:
             new_node.prev = self.tail # Connect the previous tail to the new node
             self.tail.next = new_node # Connect new node to the previous tail
             self.tail = new_node      # Update the tail to point to the new node
+        return new_node
 
     
     def insert_after(self, value, new_value):
         # This function will insert into the middle of a linked list by adding a 
         # 'new_value' after the first occurance of 'value' in the linked list.
 
-        # Search for the node that matches 'value' by starting at the 
-        # head of the list.
-        curr = self.head
-        while curr is not None:
-            if curr.data == value:
-                # If the location of 'value' is at the end of the list,
-                # then we can call insert_tail to add 'new_value'
-                if curr == self.tail:
-                    self.insert_tail(new_value)
-                # For any other location of 'value', we need to create a 
-                # new node and reconnect the links to insert.
-                else:
-                    new_node = LinkedList.Node(new_value)
-                    new_node.prev = curr       # Connect new node to the node containing 'value'
-                    new_node.next = curr.next  # Connect new node to the node after 'value'
-                    curr.next.prev = new_node  # Connect node after 'value' to the new node
-                    curr.next = new_node       # Connect the node containing 'value' to the new node
-                return # We can exit the function after we insert
-            curr = curr.next # Go to the next node to search for 'value'
+        # Find the node that matches 'value'.
+        curr = self._find(value)
+        if curr is None:
+            return
+        # If the location of 'value' is at the end of the list,
+        # then we can call insert_tail to add 'new_value'
+        if curr == self.tail:
+            self.insert_tail(new_value)
+        # For any other location of 'value', we need to create a 
+        # new node and reconnect the links to insert.
+        else:
+            new_node = LinkedList.Node(new_value)
+            self.count += 1
+            if self.index is not None:
+                self._index_add(new_node)
+            new_node.prev = curr       # Connect new node to the node containing 'value'
+            new_node.next = curr.next  # Connect new node to the node after 'value'
+            curr.next.prev = new_node  # Connect node after 'value' to the new node
+            curr.next = new_node       # Connect the node containing 'value' to the new node
 
     def remove_head(self):
         # This function will remove the head from the linked list
@@ -75,6 +112,10 @@ class LinkedList:
         # If the list has only one item in it, then set head and tail 
         # to None resulting in an empty list.  This condition will also
         # cover an empty list.  Its okay to set to None again.
+        if self.head is not None:
+            self.count -= 1
+            if self.index is not None:
+                self._index_discard(self.head)
         if self.head == self.tail:
             self.head = None
             self.tail = None
@@ -90,6 +131,10 @@ class LinkedList:
         # If the list has only one item in it, then set head and tail 
         # to None resulting in an empty list.  This condition will also
         # cover an empty list.  Its okay to set to None again.
+        if self.tail is not None:
+            self.count -= 1
+            if self.index is not None:
+                self._index_discard(self.tail)
         if self.head == self.tail:
             self.head = None
             self.tail = None
@@ -99,33 +144,175 @@ class LinkedList:
             self.tail.prev.next = None  # Set the "next" of the second to last node to nothing
             self.tail = self.tail.prev  # Set the tail to be the second to last node
 
+    def pop_head(self):
+        # This function will remove the head and return its value.  An
+        # IndexError is raised if the list is empty (just like list.pop).
+        if self.head is None:
+            raise IndexError("pop from empty linked list")
+        value = self.head.data
+        self.remove_head()
+        return value
+
+    def pop_tail(self):
+        # This function will remove the tail and return its value.
+        if self.tail is None:
+            raise IndexError("pop from empty linked list")
+        value = self.tail.data
+        self.remove_tail()
+        return value
+
     def remove(self, value):
         # This function will remove the first node that contains 'value'.
         
-        # Search for the node that matches 'value' by starting at the 
-        # head of the list.
-        curr = self.head
-        # Loop until we have reached the end (None)
-        while curr is not None:
-            if curr.data == value:
-                if curr == self.head:
-                    self.remove_head()
-                    return
-                elif curr == self.tail:
-                    self.remove_tail()
-                    return                      
-                else:
-                    # Set the prev of the node after curr to the node before curr 
-                    curr.next.prev = curr.prev
-                    # Set the next of the node before curr to the node after curr 
-                    curr.prev.next = curr.next 
-                    curr = None
-                    return
-            # Follow the pointer to the next node
-            curr = curr.next        
+        # Find the node that matches 'value'.
+        curr = self._find(value)
         # if value was not present in linked list
-        if(curr == None):
+        if curr is None:
+            return
+        self.remove_node(curr)
+
+    def remove_node(self, node):
+        # This function will remove 'node' (which must be in this list)
+        # without searching for it.
+        if node == self.head:
+            self.remove_head()
+        elif node == self.tail:
+            self.remove_tail()
+        else:
+            self.count -= 1
+            if self.index is not None:
+                self._index_discard(node)
+            # Set the prev of the node after 'node' to the node before it
+            node.next.prev = node.prev
+            # Set the next of the node before 'node' to the node after it
+            node.prev.next = node.next 
+
+    def move_to_head(self, node):
+        # This function will move 'node' (which must be in this list) to
+        # the head of the list by relinking it.  No node is created or
+        # removed, so the index does not change.
+        if node == self.head:
             return
+        # Disconnect the node from its neighbors
+        node.prev.next = node.next
+        if node == self.tail:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        # Connect it in front of the current head
+        node.prev = None
+        node.next = self.head
+        self.head.prev = node
+        self.head = node
+
+    def extend(self, values):
+        # This function will add every value from the iterable 'values' to
+        # the tail.  The new nodes are linked to each other first and the
+        # whole chain is attached to the tail once at the end, which is
+        # faster than calling insert_tail for each value.
+        first = None
+        last = None
+        added = 0
+        Node = LinkedList.Node
+        for value in values:
+            new_node = Node(value)
+            if last is None:
+                first = new_node
+            else:
+                new_node.prev = last
+                last.next = new_node
+            last = new_node
+            added += 1
+        if first is None:
+            return
+        self._attach_tail(first, last, added)
+
+    def concat(self, other):
+        # This function will move every node from the LinkedList 'other' to
+        # the end of this list, leaving 'other' empty.  Only the links at
+        # the two ends change, so this is O(1) (unless this list is indexed,
+        # in which case the moved nodes also have to be indexed).
+        if other is self:
+            raise ValueError("cannot concat a list to itself")
+        if other.head is None:
+            return
+        first, last, added = other.head, other.tail, other.count
+        other.head = None
+        other.tail = None
+        other.count = 0
+        if other.index is not None:
+            other.index = {}
+        self._attach_tail(first, last, added)
+
+    def split_at(self, node):
+        # This function will cut the list in front of 'node' (which must be
+        # in this list).  This list keeps the nodes before 'node' and a new
+        # LinkedList with 'node' and everything after it is returned.
+        # To keep the count up to date, the shorter of the two halves is
+        # counted by walking from 'node' in both directions at once.
+        rest = LinkedList(indexed=self.index is not None)
+        forward = node
+        backward = node.prev
+        counted = 0
+        while forward is not None and backward is not None:
+            forward = forward.next
+            backward = backward.prev
+            counted += 1
+        if forward is None:
+            moved = counted     # The nodes from 'node' to the tail
+        else:
+            moved = self.count - counted # Everything except the first half
+
+        rest.head = node
+        rest.tail = self.tail
+        rest.count = moved
+        if node.prev is None:
+            self.head = None
+            self.tail = None
+        else:
+            self.tail = node.prev
+            self.tail.next = None
+            node.prev = None
+        self.count -= moved
+
+        # The moved nodes belong to the other list's index now
+        if self.index is not None:
+            curr = node
+            while curr is not None:
+                self._index_discard(curr)
+                rest._index_add(curr)
+                curr = curr.next
+        return rest
+
+    def remove_if(self, predicate):
+        # This function will remove every node whose value makes
+        # predicate(value) true, in a single pass from the head.  The
+        # number of nodes removed is returned.
+        removed = 0
+        curr = self.head
+        while curr is not None:
+            following = curr.next
+            if predicate(curr.data):
+                self.remove_node(curr)
+                removed += 1
+            curr = following
+        return removed
+
+    def _attach_tail(self, first, last, added):
+        # Connect the chain of nodes from 'first' to 'last' (holding 'added'
+        # nodes) after the current tail.
+        if self.index is not None:
+            curr = first
+            while curr is not None:
+                self._index_add(curr)
+                curr = curr.next
+        if self.tail is None:
+            self.head = first
+        else:
+            self.tail.next = first
+            first.prev = self.tail
+        self.tail = last
+        self.count += added
 
     #This function will search for all nodes that are equal to 'old_value' and replace them with 'new_value'
     def replace(self, old_value, new_value):
@@ -133,6 +320,19 @@ class LinkedList:
         Search for all instances of 'old_value' and replace the value 
         to 'new_value'.
         """
+        # With an index, the nodes holding 'old_value' are already known,
+        # so they are moved over to 'new_value' in the index as well.
+        if self.index is not None:
+            if old_value == new_value:
+                return
+            nodes = self.index.pop(old_value, None)
+            if nodes is None:
+                return
+            for curr in nodes:
+                curr.data = new_value
+                self._index_add(curr)
+            return
+
         # Search for the node that matches 'old_value' by starting at the 
         # head of the list.
         curr = self.head
@@ -141,21 +341,146 @@ class LinkedList:
             # Replace the current value in the node with the new value
             if curr.data == old_value:
                 curr.data = new_value
-            else:
-                # Follow the pointer to the next node
+            # Follow the pointer to the next node
+            curr = curr.next
+
+    def __contains__(self, value):
+        # This function supports the 'in' keyword: if 5 in ll: ...
+        return self._find(value) is not None
+
+    def _find(self, value):
+        # This function returns the first node that contains 'value' or
+        # None if there is no such node.  With an index this is a
+        # dictionary lookup, otherwise we search starting at the head.
+        if self.index is not None:
+            nodes = self.index.get(value)
+            if not nodes:
+                return None
+            if len(nodes) == 1:
+                return next(iter(nodes))
+            # The index does not know which duplicate comes first, so
+            # search from the head for the first node it holds.
+            curr = self.head
+            while curr not in nodes:
                 curr = curr.next
+            return curr
+        curr = self.head
+        while curr is not None:
+            if curr.data == value:
+                return curr
+            curr = curr.next
+        return None
+
+    def _index_add(self, node):
+        # Record 'node' under its value.  Each value maps to a dictionary
+        # used as an ordered set of nodes, so one node can be removed in
+        # O(1) and the oldest node is always first.
+        nodes = self.index.get(node.data)
+        if nodes is None:
+            self.index[node.data] = {node: None}
+        else:
+            nodes[node] = None
+
+    def _index_discard(self, node):
+        # Forget 'node' and drop its value from the index once no node
+        # holds it anymore.
+        nodes = self.index[node.data]
+        del nodes[node]
+        if not nodes:
+            del self.index[node.data]
     def __str__(self):
         # This function will assist us in testing our code by returning a string representation of the linked list.
-        output = "linkedlist["
-        first = True
+        # The pieces are collected in a list and joined once, so this is
+        # linear.  Only the first 'preview_length' values are shown (all
+        # of them if it is None); use dump to write out a whole list.
+        limit = self.preview_length
+        parts = []
         for value in self:
-            if first:
-                first = False
-            else:
-                output += ", "
-            output += str(value)
-        output += "]"
-        return output
+            if limit is not None and len(parts) == limit:
+                parts.append(f"... {self.count - limit} more")
+                break
+            parts.append(str(value))
+        return "linkedlist[" + ", ".join(parts) + "]"
+
+    __repr__ = __str__
+
+    def dump(self, file, format="text", chunk_size=1024):
+        """
+        Write every value to the open 'file', 'chunk_size' values at a
+        time, so the whole list is never turned into one big string.
+        The formats are:
+
+        "text"   - str(value) on its own line (file opened in text mode).
+                   A ValueError is raised for a value that contains a
+                   line break, since it would load back as several values.
+        "jsonl"  - each value as JSON on its own line (text mode)
+        "binary" - a header followed by pickled chunks of values (file
+                   opened in binary mode).  Only load binary files from
+                   a source you trust, since unpickling can run code.
+        """
+        if format == "binary":
+            file.write(LinkedList._BINARY_MAGIC)
+            pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+            for chunk in self._chunks(chunk_size):
+                pickler.dump(chunk)
+                pickler.clear_memo()
+            return
+
+        if format == "text":
+            to_line = str
+        elif format == "jsonl":
+            to_line = json.dumps
+        else:
+            raise ValueError(f"unknown format: {format!r}")
+        for chunk in self._chunks(chunk_size):
+            text = "\n".join(map(to_line, chunk))
+            # A chunk of n values joined together has exactly n - 1 line
+            # breaks, unless a value has one of its own ("\r" counts too,
+            # since files opened in text mode read it as a line break)
+            if format == "text" and (text.count("\n") != len(chunk) - 1 or "\r" in text):
+                raise ValueError("a value written as text cannot contain a line break")
+            file.write(text + "\n")
+
+    @classmethod
+    def load(cls, file, format="text", convert=None, indexed=False):
+        """
+        Build a new LinkedList from a 'file' written by dump, reading it
+        a line (or a chunk) at a time.  For the "text" format each value
+        is read back as a string, unless a 'convert' function (such as
+        int) is given.
+        """
+        ll = cls(indexed=indexed)
+        if format == "binary":
+            if file.read(len(LinkedList._BINARY_MAGIC)) != LinkedList._BINARY_MAGIC:
+                raise ValueError("not a binary linked list file")
+            unpickler = pickle.Unpickler(file)
+            while True:
+                try:
+                    ll.extend(unpickler.load())
+                except EOFError:
+                    return ll
+
+        if format == "text":
+            values = (line.rstrip("\n") for line in file)
+            if convert is not None:
+                values = map(convert, values)
+        elif format == "jsonl":
+            values = (json.loads(line) for line in file if line.strip())
+        else:
+            raise ValueError(f"unknown format: {format!r}")
+        ll.extend(values)
+        return ll
+
+    def _chunks(self, chunk_size):
+        # Yield the values in lists of up to 'chunk_size' values
+        chunk = []
+        for value in self:
+            chunk.append(value)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
     def __iter__(self):
         # This function will iterate forward through a linked list.
@@ -172,20 +497,83 @@ class LinkedList:
             yield curr.data  # Provide (yield) each item to the user
             curr = curr.prev # Go backward in the linked list
 
-# Sample test cases for the Example Problem as "linkedlist[expected results]":
-ll = LinkedList()
-ll.insert_tail(1)
-ll.insert_head(2)
-ll.insert_head(2)
-ll.insert_head(2)
-ll.insert_head(3)
-ll.insert_head(4)
-ll.insert_head(5)
-print(ll) # linkedlist[5, 4, 3, 2, 2, 2, 1]
-ll.replace(1, 2)
-print(ll) # linkedlist[5, 4, 3, 2, 2, 2, 2]
-ll.replace(2, 1)
-print(ll) # linkedlist[5, 4, 3, 1, 1, 1, 1]
-
-# Sample test case for the Problem to Solve:
-print(list(reversed(ll)))  # [1, 1, 1, 1, 3, 4, 5]
\ No newline at end of file
+
+def main():
+    # Sample test cases for the Example Problem as "linkedlist[expected results]":
+    ll = LinkedList()
+    ll.insert_tail(1)
+    ll.insert_head(2)
+    ll.insert_head(2)
+    ll.insert_head(2)
+    ll.insert_head(3)
+    ll.insert_head(4)
+    ll.insert_head(5)
+    print(ll) # linkedlist[5, 4, 3, 2, 2, 2, 1]
+    ll.replace(1, 2)
+    print(ll) # linkedlist[5, 4, 3, 2, 2, 2, 2]
+    ll.replace(2, 1)
+    print(ll) # linkedlist[5, 4, 3, 1, 1, 1, 1]
+
+    # Sample test case for the Problem to Solve:
+    print(list(reversed(ll)))  # [1, 1, 1, 1, 3, 4, 5]
+
+    # Test cases for the indexed linked list
+    ll2 = LinkedList(indexed=True)
+    for value in [1, 2, 3, 4, 5]:
+        ll2.insert_tail(value)
+    ll2.insert_after(3, 9)
+    ll2.remove(1)
+    ll2.remove(5)
+    print(ll2) # linkedlist[2, 3, 9, 4]
+    ll2.replace(9, 3)
+    print(ll2, 3 in ll2, 9 in ll2) # linkedlist[2, 3, 3, 4] True False
+    ll2.remove(3)
+    ll2.remove(3)
+    print(ll2, 3 in ll2) # linkedlist[2, 4] False
+    ll2 = LinkedList(indexed=True)
+    ll2.insert_tail(1)
+    ll2.insert_head(1)
+    ll2.insert_after(1, 9)  # After the first 1, just like without the index
+    print(ll2) # linkedlist[1, 9, 1]
+
+    # Test cases for building, joining and splitting lists
+    ll3 = LinkedList()
+    ll3.extend(range(1, 6))
+    ll4 = LinkedList()
+    ll4.extend([6, 7, 8])
+    ll3.concat(ll4)
+    print(ll3, len(ll3), len(ll4)) # linkedlist[1, 2, 3, 4, 5, 6, 7, 8] 8 0
+    ll5 = ll3.split_at(ll3.head.next.next)
+    print(ll3, len(ll3)) # linkedlist[1, 2] 2
+    print(ll5, len(ll5)) # linkedlist[3, 4, 5, 6, 7, 8] 6
+    print(ll5.remove_if(lambda value: value % 2 == 0), ll5, len(ll5)) # 3 linkedlist[3, 5, 7] 3
+
+    # Test cases for writing and reading lists
+    import io
+    ll6 = LinkedList()
+    ll6.extend(range(2000))
+    print(str(ll6)[-30:]) # 997, 998, 999, ... 1000 more]
+    text_file = io.StringIO()
+    ll6.dump(text_file, chunk_size=300)
+    text_file.seek(0)
+    print(list(LinkedList.load(text_file, convert=int)) == list(range(2000))) # True
+    binary_file = io.BytesIO()
+    ll7 = LinkedList()
+    ll7.extend([1, "two", (3, 4.0)])
+    ll7.dump(binary_file, "binary")
+    binary_file.seek(0)
+    print(LinkedList.load(binary_file, "binary")) # linkedlist[1, two, (3, 4.0)]
+    json_file = io.StringIO()
+    ll7.dump(json_file, "jsonl")
+    json_file.seek(0)
+    print(LinkedList.load(json_file, "jsonl")) # linkedlist[1, two, [3, 4.0]]
+    ll8 = LinkedList()
+    ll8.extend(["a\nb", "c"])
+    try:
+        ll8.dump(io.StringIO())
+    except ValueError as error:
+        print(error) # a value written as text cannot contain a line break
+
+
+if __name__ == "__main__":
+    main()
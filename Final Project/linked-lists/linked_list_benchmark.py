@@ -0,0 +1,229 @@
+# Benchmarks for the LinkedList class in linked_list.py
+
+"""
+This program will time the LinkedList operations that look for a value
+(remove, insert_after, replace and 'in') on a list of 1,000,000 values.
+
+Without an index, each of these searches from the head, so a value near
+the tail costs about a million steps.  With LinkedList(indexed=True) the
+node is found with one dictionary lookup.
+
+It also compares the memory used per value and the time to iterate for
+the LinkedList, the UnrolledLinkedList, collections.deque and list, and
+times the bulk operations (extend, concat, split_at and remove_if).
+
+Several producer and consumer threads pass values through a
+BlockingLinkedList, a queue.Queue and a collections.deque to compare
+their throughput.
+
+Last, keeping values in sorted order is compared between a SkipList and
+a plain list with bisect.insort.
+
+Run it from this folder:
+
+    python linked_list_benchmark.py
+
+"""
+import bisect
+import queue
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+if __package__:
+    from .blocking_linked_list import BlockingLinkedList
+    from .linked_list import LinkedList
+    from .skip_list import SkipList
+    from .unrolled_linked_list import UnrolledLinkedList
+else:
+    from blocking_linked_list import BlockingLinkedList
+    from linked_list import LinkedList
+    from skip_list import SkipList
+    from unrolled_linked_list import UnrolledLinkedList
+
+
+def build(count, indexed):
+    # Build a list holding 0..count-1 and return (list, seconds)
+    start = time.perf_counter()
+    ll = LinkedList(indexed=indexed)
+    for value in range(count):
+        ll.insert_tail(value)
+    return ll, time.perf_counter() - start
+
+
+def time_per_call(function, values):
+    # Call function(value) for each value and return the seconds per call
+    start = time.perf_counter()
+    for value in values:
+        function(value)
+    return (time.perf_counter() - start) / len(values)
+
+
+def benchmark_keyed_operations(count=1_000_000):
+    print("\n=========== KEYED OPERATIONS: LinkedList with and without an index ===========")
+    print(f"{'list':<10}{'build':>10}{'in':>14}{'insert_after':>14}{'replace':>14}{'remove':>14}")
+
+    for indexed in (False, True):
+        ll, build_seconds = build(count, indexed)
+
+        # Every call targets a value near the tail of the list.  The
+        # unindexed list only gets a few calls since each one is so slow.
+        calls = 1000 if indexed else 5
+        targets = range(count - 1 - calls, count - 1)
+
+        contains = time_per_call(lambda value: value in ll, targets)
+        insert_after = time_per_call(lambda value: ll.insert_after(value, -value), targets)
+        replace = time_per_call(lambda value: ll.replace(-value, value + count), targets)
+        remove = time_per_call(ll.remove, targets)
+
+        name = "indexed" if indexed else "plain"
+        print(f"{name:<10}{build_seconds:>9.2f}s" + "".join(
+            f"{seconds * 1e6:>12.1f}us" for seconds in (contains, insert_after, replace, remove)))
+
+
+def fill(container, values):
+    # Add the values to the end of any of the containers being compared
+    if isinstance(container, (list, deque)):
+        container.extend(values)
+    else:
+        for value in values:
+            container.insert_tail(value)
+    return container
+
+
+def benchmark_memory_and_iteration(count=1_000_000):
+    print("\n=========== MEMORY AND ITERATION: LinkedList vs UnrolledLinkedList ===========")
+    print(f"{'container':<22}{'bytes/value':>12}{'iterate':>12}")
+
+    # The values are made before measuring so only the container is counted
+    values = list(range(count))
+    makers = (("LinkedList", LinkedList),
+              ("UnrolledLinkedList", UnrolledLinkedList),
+              ("collections.deque", deque),
+              ("list", list))
+    for name, make in makers:
+        tracemalloc.start()
+        container = fill(make(), values)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for _ in container:
+            pass
+        seconds = time.perf_counter() - start
+        print(f"{name:<22}{size / count:>12.1f}{seconds * 1000:>10.1f}ms")
+
+
+def benchmark_bulk_operations(count=1_000_000):
+    print("\n=========== BULK OPERATIONS ===========")
+    values = list(range(count))
+
+    start = time.perf_counter()
+    one_at_a_time = LinkedList()
+    for value in values:
+        one_at_a_time.insert_tail(value)
+    print(f"insert_tail x {count:,} {time.perf_counter() - start:>10.3f}s")
+
+    start = time.perf_counter()
+    ll = LinkedList()
+    ll.extend(values)
+    print(f"extend {count:,}        {time.perf_counter() - start:>10.3f}s")
+
+    start = time.perf_counter()
+    ll.concat(one_at_a_time)
+    print(f"concat {count:,}        {time.perf_counter() - start:>10.6f}s")
+
+    start = time.perf_counter()
+    ll.split_at(ll.tail)
+    print(f"split_at tail           {time.perf_counter() - start:>10.6f}s")
+
+    start = time.perf_counter()
+    removed = ll.remove_if(lambda value: value % 2 == 0)
+    print(f"remove_if ({removed:,} removed) {time.perf_counter() - start:>8.3f}s")
+
+
+def run_producers_and_consumers(put, get, producers, consumers, count):
+    """
+    Start 'producers' threads that each call put(value) 'count' times and
+    'consumers' threads that call get() until they have taken all of the
+    values between them.  Each producer finishes by putting one None per
+    consumer so the consumers know to stop.  Return values moved per second.
+    """
+    def produce():
+        for value in range(count):
+            put(value)
+
+    def consume():
+        while get() is not None:
+            pass
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    threads += [threading.Thread(target=consume) for _ in range(consumers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads[:producers]:
+        thread.join()
+    for _ in range(consumers):
+        put(None)
+    for thread in threads[producers:]:
+        thread.join()
+    return producers * count / (time.perf_counter() - start)
+
+
+def benchmark_producers_and_consumers(producers=4, consumers=4, count=100_000):
+    print("\n=========== PRODUCERS AND CONSUMERS ===========")
+
+    blocking = BlockingLinkedList(capacity=10_000)
+    standard = queue.Queue(maxsize=10_000)
+    fast = deque()
+
+    def deque_get():
+        # A deque cannot wait for values, so the consumer has to poll
+        while True:
+            try:
+                return fast.popleft()
+            except IndexError:
+                time.sleep(0)
+
+    queues = (("BlockingLinkedList", blocking.insert_tail, blocking.pop_head),
+              ("queue.Queue", standard.put, standard.get),
+              ("collections.deque", fast.append, deque_get))
+    for name, put, get in queues:
+        rate = run_producers_and_consumers(put, get, producers, consumers, count)
+        print(f"{name:<22}{producers}P/{consumers}C {rate:>14,.0f} values/s")
+
+
+def benchmark_sorted_inserts(sizes=(10_000, 100_000, 1_000_000)):
+    print("\n=========== SORTED INSERTS: SkipList vs bisect.insort ===========")
+    for count in sizes:
+        values = [random.random() for _ in range(count)]
+
+        start = time.perf_counter()
+        skip_list = SkipList(seed=0)
+        for value in values:
+            skip_list.insert(value)
+        skip_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ordered = []
+        for value in values:
+            bisect.insort(ordered, value)
+        insort_seconds = time.perf_counter() - start
+
+        print(f"{count:>10,} values  SkipList {skip_seconds:>8.3f}s"
+              f"   bisect.insort {insort_seconds:>8.3f}s")
+
+
+def main():
+    benchmark_keyed_operations()
+    benchmark_memory_and_iteration()
+    benchmark_bulk_operations()
+    benchmark_producers_and_consumers()
+    benchmark_sorted_inserts()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# An LRU (least recently used) cache built on the doubly linked list
+
+"""
+A cache keeps the results of slow work so they can be reused.  When the
+cache is full, something has to be thrown away, and a good choice is the
+entry that has gone unused for the longest time.
+
+The LinkedList already has everything needed to track that order:
+
+1) A dictionary maps each key to the node holding its entry, so an entry
+   is found in O(1) without searching the list.
+2) Every time an entry is used, its node is moved to the head of the list
+   with move_to_head, which only relinks a few pointers.
+3) The least recently used entry is therefore always at the tail, and
+   remove_tail evicts it in O(1).
+
+Entries can also be limited by total size in bytes and by age (a time to
+live, in seconds).  The cache counts its hits, misses, evictions and
+expirations, and lru_cache turns it into a decorator that remembers the
+results of a function.
+"""
+import sys
+import time
+from collections import namedtuple
+from functools import update_wrapper
+
+if __package__:
+    from .linked_list import LinkedList
+else:
+    from linked_list import LinkedList
+
+
+CacheInfo = namedtuple("CacheInfo", "hits misses evictions expirations items bytes")
+
+# Used by get to tell "not found" apart from a cached value of None
+_MISSING = object()
+
+
+class LRUCache:
+    # This class is an LRU cache with optional size and time limits
+
+    class Entry:
+        # The data stored in each linked list node
+        __slots__ = ("key", "value", "size", "expires")
+
+        def __init__(self, key, value, size, expires):
+            self.key = key
+            self.value = value
+            self.size = size
+            self.expires = expires
+
+    def __init__(self, max_items=128, max_bytes=None, ttl=None,
+                 size_of=sys.getsizeof, clock=time.monotonic):
+        """
+        Create an empty cache.  'max_items' is the largest number of
+        entries to keep (None for no limit).  'max_bytes' limits the
+        total of size_of(value) over all entries, and 'ttl' is how many
+        seconds an entry stays valid after it is put.  'clock' is the
+        function used to tell the time.
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of
+        self.clock = clock
+        self.nodes = {}           # key -> node in self.order
+        self.order = LinkedList() # most recently used at the head
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, key):
+        # Checks if 'key' has a live entry.  This does not count as a use.
+        node = self.nodes.get(key)
+        return node is not None and not self._expired(node.data)
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for 'key' and mark it as the most recently
+        used, or return 'default' if the key is not in the cache (or its
+        time to live has passed).
+        """
+        node = self.nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        if self._expired(node.data):
+            self._remove(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.order.move_to_head(node)
+        self.hits += 1
+        return node.data.value
+
+    def put(self, key, value):
+        """
+        Store 'value' for 'key' as the most recently used entry, then
+        evict entries from the tail until the cache is within its limits.
+        A value bigger than max_bytes on its own is not stored (and any
+        old value for 'key' is removed, so it cannot be returned later).
+        """
+        size = self.size_of(value) if self.max_bytes is not None else 0
+        node = self.nodes.get(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Storing it would evict every other entry, so skip it
+            if node is not None:
+                self._remove(node)
+            return
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+
+        if node is not None:
+            # Update the existing entry in place
+            entry = node.data
+            self.bytes += size - entry.size
+            entry.value = value
+            entry.size = size
+            entry.expires = expires
+            self.order.move_to_head(node)
+        else:
+            entry = LRUCache.Entry(key, value, size, expires)
+            self.nodes[key] = self.order.insert_head(entry)
+            self.bytes += size
+
+        self._evict()
+
+    def delete(self, key):
+        # Remove 'key' from the cache.  Return True if it was there.
+        node = self.nodes.get(key)
+        if node is None:
+            return False
+        self._remove(node)
+        return True
+
+    def clear(self):
+        # Remove every entry but keep the statistics
+        self.nodes = {}
+        self.order = LinkedList()
+        self.bytes = 0
+
+    def cache_info(self):
+        # Return the statistics for the cache
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.expirations, len(self.nodes), self.bytes)
+
+    def _expired(self, entry):
+        return entry.expires is not None and self.clock() >= entry.expires
+
+    def _remove(self, node):
+        # Unlink 'node' from the list and forget its key
+        self.order.remove_node(node)
+        del self.nodes[node.data.key]
+        self.bytes -= node.data.size
+
+    def _evict(self):
+        # Remove the least recently used entries (at the tail) until the
+        # number of entries and the total bytes are within the limits.
+        while self.order.tail is not None and (
+                (self.max_items is not None and len(self.nodes) > self.max_items) or
+                (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self._remove(self.order.tail)
+            self.evictions += 1
+
+
+def lru_cache(max_items=128, max_bytes=None, ttl=None, size_of=sys.getsizeof):
+    """
+    A decorator that remembers the results of a function in an LRUCache:
+
+    @lru_cache(max_items=1000, ttl=60)
+    def lookup(user_id):
+        ...
+
+    The arguments must be hashable.  The cache is available as
+    lookup.cache, and lookup.cache_info() returns its statistics.
+    """
+    def decorator(function):
+        cache = LRUCache(max_items, max_bytes, ttl, size_of)
+
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                key += (_MISSING,) + tuple(sorted(kwargs.items()))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = function(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.cache_info
+        wrapper.cache_clear = cache.clear
+        return update_wrapper(wrapper, function)
+
+    return decorator
+
+
+def main():
+    # Test cases for the LRU cache
+    cache1 = LRUCache(max_items=2)
+    cache1.put("a", 1)
+    cache1.put("b", 2)
+    cache1.get("a")
+    cache1.put("c", 3)  # "b" is the least recently used, so it is evicted
+    print(cache1.get("a"), cache1.get("b"), cache1.get("c")) # 1 None 3
+    print(cache1.cache_info()) # CacheInfo(hits=3, misses=1, evictions=1, expirations=0, items=2, bytes=0)
+
+    now = [0.0]
+    cache2 = LRUCache(ttl=10, clock=lambda: now[0])
+    cache2.put("x", "value")
+    now[0] = 11.0
+    print(cache2.get("x"), len(cache2)) # None 0
+
+    cache3 = LRUCache(max_items=None, max_bytes=10, size_of=len)
+    cache3.put("a", "12345")
+    cache3.put("b", "123456")  # 11 bytes in total, so "a" is evicted
+    print("a" in cache3, "b" in cache3, cache3.bytes) # False True 6
+    cache3.put("c", "x" * 50)  # Too big to store, so "b" is kept
+    print("b" in cache3, "c" in cache3, cache3.cache_info().evictions) # True False 1
+
+    @lru_cache(max_items=100)
+    def fibonacci(n):
+        return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+    print(fibonacci(80)) # 23416728348467685
+    print(fibonacci.cache_info().misses) # 81
+
+
+if __name__ == "__main__":
+    main()
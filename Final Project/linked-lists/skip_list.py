@@ -0,0 +1,193 @@
+# A sorted linked list with express lanes (a skip list)
+
+"""
+If a LinkedList is kept in sorted order, finding the place for a new value
+still means walking from the head one node at a time, so every insert,
+remove and search is O(n).
+
+A skip list is a sorted doubly linked list where some nodes also have
+links that jump further ahead, like express lanes on a highway:
+
+    level 2:  head ---------------------> 30 ------------------> None
+    level 1:  head ------> 10 ----------> 30 ------> 50 -------> None
+    level 0:  head -> 5 -> 10 -> 20 -> 25 -> 30 -> 40 -> 50 -> 60 -> None
+
+To find a value, start on the top level and move right while the next
+value is smaller, then drop down a level and repeat.  Each new node is
+given a random number of levels (each extra level with a chance of 1/2),
+so on average every level skips over half of the level below it, and the
+expected cost of a search, insert or remove is O(log n).
+
+Level 0 is a normal doubly linked list (each node also has a 'prev'
+link), so iterating forward or backward works just like the LinkedList.
+"""
+import random
+
+
+class SkipList:
+    # This class is a sorted linked list with O(log n) insert, remove and search
+
+    class Node:
+        # 'next' is a list with one forward link per level of the node
+        __slots__ = ("data", "next", "prev")
+
+        def __init__(self, data, levels):
+            self.data = data
+            self.next = [None] * levels
+            self.prev = None
+
+    def __init__(self, seed=None, max_levels=32):
+        # The header is an empty node with every level, so each lane starts
+        # from it.  'seed' makes the random levels (and so the shape of the
+        # list) the same every run.
+        self.max_levels = max_levels
+        self.header = SkipList.Node(None, max_levels)
+        self.levels = 1 # The number of levels currently in use
+        self.tail = None
+        self.count = 0
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, value):
+        # Insert 'value' in sorted order (after any values equal to it).
+        # 'update' remembers the last node before the new one on each
+        # level, since those are the links that have to change.
+        update = self._path(value, after_equal=True)
+        levels = self._random_levels()
+        if levels > self.levels:
+            for level in range(self.levels, levels):
+                update[level] = self.header
+            self.levels = levels
+
+        new_node = SkipList.Node(value, levels)
+        for level in range(levels):
+            new_node.next[level] = update[level].next[level]
+            update[level].next[level] = new_node
+
+        # Connect the backward link on level 0
+        before = update[0]
+        new_node.prev = before if before is not self.header else None
+        after = new_node.next[0]
+        if after is None:
+            self.tail = new_node
+        else:
+            after.prev = new_node
+        self.count += 1
+        return new_node
+
+    def remove(self, value):
+        # Remove the first node that contains 'value'.  Return True if a
+        # node was removed, otherwise return False.
+        update = self._path(value, after_equal=False)
+        node = update[0].next[0]
+        if node is None or node.data != value:
+            return False
+
+        for level in range(len(node.next)):
+            update[level].next[level] = node.next[level]
+
+        after = node.next[0]
+        if after is None:
+            self.tail = node.prev
+        else:
+            after.prev = node.prev
+
+        # Stop using levels that no longer have any nodes
+        while self.levels > 1 and self.header.next[self.levels - 1] is None:
+            self.levels -= 1
+        self.count -= 1
+        return True
+
+    def find(self, value):
+        # Return the first node that contains 'value', or None
+        node = self._path(value, after_equal=False)[0].next[0]
+        if node is not None and node.data == value:
+            return node
+        return None
+
+    def __contains__(self, value):
+        return self.find(value) is not None
+
+    def floor(self, value):
+        # Return the largest value less than or equal to 'value', or None
+        node = self._path(value, after_equal=True)[0]
+        return node.data if node is not self.header else None
+
+    def ceiling(self, value):
+        # Return the smallest value greater than or equal to 'value', or None
+        node = self._path(value, after_equal=False)[0].next[0]
+        return node.data if node is not None else None
+
+    def range(self, low, high):
+        # Yield every value from 'low' to 'high' (both included) in order.
+        # The express lanes find 'low' and then level 0 is followed.
+        node = self._path(low, after_equal=False)[0].next[0]
+        while node is not None and node.data <= high:
+            yield node.data
+            node = node.next[0]
+
+    def __str__(self):
+        return "linkedlist[" + ", ".join(str(value) for value in self) + "]"
+
+    def __iter__(self):
+        # This function will iterate forward through the list (smallest first).
+        curr = self.header.next[0]
+        while curr is not None:
+            yield curr.data
+            curr = curr.next[0]
+
+    def __reversed__(self):
+        # This function will iterate backward through the list (largest first).
+        curr = self.tail
+        while curr is not None:
+            yield curr.data
+            curr = curr.prev
+
+    def _path(self, value, after_equal):
+        """
+        Return a list holding, for every level, the last node whose value
+        is less than 'value' (or less than or equal to 'value' when
+        'after_equal' is True).  The search starts on the top level and
+        drops down one level at a time.
+        """
+        update = [self.header] * self.max_levels
+        node = self.header
+        for level in range(self.levels - 1, -1, -1):
+            following = node.next[level]
+            if after_equal:
+                while following is not None and following.data <= value:
+                    node = following
+                    following = node.next[level]
+            else:
+                while following is not None and following.data < value:
+                    node = following
+                    following = node.next[level]
+            update[level] = node
+        return update
+
+    def _random_levels(self):
+        # Each node has 1 level, plus 1 more with a chance of 1/2, plus 1
+        # more with a chance of 1/4, and so on.
+        levels = 1
+        while levels < self.max_levels and self.random.random() < 0.5:
+            levels += 1
+        return levels
+
+
+def main():
+    # Test cases for the skip list
+    sl = SkipList(seed=212)
+    for value in [30, 10, 50, 20, 40, 20]:
+        sl.insert(value)
+    print(sl, len(sl)) # linkedlist[10, 20, 20, 30, 40, 50] 6
+    print(list(reversed(sl))) # [50, 40, 30, 20, 20, 10]
+    print(sl.remove(20), sl.remove(25), len(sl)) # True False 5
+    print(30 in sl, 35 in sl) # True False
+    print(sl.floor(35), sl.ceiling(35), sl.floor(5), sl.ceiling(55)) # 30 40 None None
+    print(list(sl.range(15, 40))) # [20, 30, 40]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# An unrolled doubly linked list
+
+"""
+In the LinkedList every value gets its own node with two pointers, so a
+long list spends most of its memory on nodes and pointers rather than on
+the values, and walking it jumps all over memory.
+
+An unrolled linked list stores up to 'capacity' values in a small Python
+list inside each node:
+
+    head                                        tail
+    [5, 4, 3, 2] <-> [2, 2, 1, 9] <-> [7, 8] <-> [6]
+
+There is only one node (and one pair of pointers) for every group of
+values, and the values in a group sit next to each other in memory.  The
+public functions are the same as the LinkedList, so either one can be
+used.
+"""
+
+
+class UnrolledLinkedList:
+
+    class Node:
+        # Each node holds a list of values and links to its neighbors
+        __slots__ = ("data", "next", "prev")
+
+        def __init__(self, data):
+            self.data = data # The list of values in this node
+            self.next = None
+            self.prev = None
+
+    def __init__(self, capacity=64):
+        # This function initializes an empty unrolled linked list.  Each
+        # node will hold at most 'capacity' values.
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.head = None
+        self.tail = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def insert_head(self, value):
+        # Insert 'value' at the front.  If the head node is full, a new
+        # node is linked in front of it.
+        if self.head is None or len(self.head.data) >= self.capacity:
+            self._link_before(self.head, [value])
+        else:
+            self.head.data.insert(0, value)
+        self.count += 1
+
+    def insert_tail(self, value):
+        # Insert 'value' at the end.  If the tail node is full, a new
+        # node is linked after it.
+        if self.tail is None or len(self.tail.data) >= self.capacity:
+            self._link_after(self.tail, [value])
+        else:
+            self.tail.data.append(value)
+        self.count += 1
+
+    def insert_after(self, value, new_value):
+        # Insert 'new_value' after the first occurrence of 'value'.  If the
+        # node holding 'value' is full, it is split in half first.
+        node, position = self._find(value)
+        if node is None:
+            return
+        if len(node.data) >= self.capacity:
+            half = len(node.data) // 2
+            self._link_after(node, node.data[half:])
+            del node.data[half:]
+            if position >= half:
+                node = node.next
+                position -= half
+        node.data.insert(position + 1, new_value)
+        self.count += 1
+
+    def remove_head(self):
+        # Remove the first value.  An empty list is left unchanged.
+        if self.head is not None:
+            self._delete(self.head, 0)
+
+    def remove_tail(self):
+        # Remove the last value.  An empty list is left unchanged.
+        if self.tail is not None:
+            self._delete(self.tail, len(self.tail.data) - 1)
+
+    def remove(self, value):
+        # Remove the first occurrence of 'value', if there is one.
+        node, position = self._find(value)
+        if node is not None:
+            self._delete(node, position)
+
+    def replace(self, old_value, new_value):
+        # Replace every occurrence of 'old_value' with 'new_value'.
+        node = self.head
+        while node is not None:
+            values = node.data
+            for i in range(len(values)):
+                if values[i] == old_value:
+                    values[i] = new_value
+            node = node.next
+
+    def __contains__(self, value):
+        return self._find(value)[0] is not None
+
+    def __str__(self):
+        return "linkedlist[" + ", ".join(str(value) for value in self) + "]"
+
+    def __iter__(self):
+        # This function will iterate forward through the list.
+        node = self.head
+        while node is not None:
+            yield from node.data
+            node = node.next
+
+    def __reversed__(self):
+        # This function will iterate backward through the list.
+        node = self.tail
+        while node is not None:
+            yield from reversed(node.data)
+            node = node.prev
+
+    def _find(self, value):
+        # Return (node, position) of the first occurrence of 'value',
+        # or (None, None) if it is not in the list.
+        node = self.head
+        while node is not None:
+            values = node.data
+            for i in range(len(values)):
+                if values[i] == value:
+                    return node, i
+            node = node.next
+        return None, None
+
+    def _delete(self, node, position):
+        """
+        Delete the value at 'position' in 'node'.  A node that becomes
+        empty is unlinked.  A node that becomes less than half full is
+        merged with the node after it when both fit in one node, so the
+        nodes stay well filled.
+        """
+        del node.data[position]
+        self.count -= 1
+        if not node.data:
+            self._unlink(node)
+            return
+        following = node.next
+        if (following is not None and len(node.data) < self.capacity // 2 and
+                len(node.data) + len(following.data) <= self.capacity):
+            node.data.extend(following.data)
+            self._unlink(following)
+
+    def _link_before(self, node, values):
+        # Create a node holding 'values' and link it in front of 'node'
+        # (or as the only node when the list is empty).
+        new_node = UnrolledLinkedList.Node(values)
+        if node is None:
+            self.head = new_node
+            self.tail = new_node
+        else:
+            new_node.next = node
+            new_node.prev = node.prev
+            if node.prev is None:
+                self.head = new_node
+            else:
+                node.prev.next = new_node
+            node.prev = new_node
+
+    def _link_after(self, node, values):
+        # Create a node holding 'values' and link it after 'node'
+        # (or as the only node when the list is empty).
+        new_node = UnrolledLinkedList.Node(values)
+        if node is None:
+            self.head = new_node
+            self.tail = new_node
+        else:
+            new_node.prev = node
+            new_node.next = node.next
+            if node.next is None:
+                self.tail = new_node
+            else:
+                node.next.prev = new_node
+            node.next = new_node
+
+    def _unlink(self, node):
+        # Disconnect 'node' from its neighbors
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+
+
+def main():
+    # Test cases for the unrolled linked list
+    ull = UnrolledLinkedList(capacity=4)
+    ull.insert_tail(1)
+    ull.insert_head(2)
+    ull.insert_head(2)
+    ull.insert_head(2)
+    ull.insert_head(3)
+    ull.insert_head(4)
+    ull.insert_head(5)
+    print(ull) # linkedlist[5, 4, 3, 2, 2, 2, 1]
+    ull.replace(2, 1)
+    ull.insert_after(3, 9)
+    print(ull, len(ull)) # linkedlist[5, 4, 3, 9, 1, 1, 1, 1] 8
+    ull.remove(9)
+    ull.remove_head()
+    ull.remove_tail()
+    print(list(reversed(ull))) # [1, 1, 1, 3, 4]
+
+
+if __name__ == "__main__":
+    main()
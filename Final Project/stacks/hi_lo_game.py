@@ -12,6 +12,11 @@ For this program, we will do the following:
 3) Pop each character from the stack and put it back to string, one at a time.
 
 """
+import io
+import mmap
+import os
+from array import array
+from collections import namedtuple
  
 # Function to create an empty stack.
 # It initializes size of stack as 0
@@ -47,51 +52,102 @@ def pop(stack):
       return
     return stack.pop()
  
+# A stack that keeps its items in one contiguous typed buffer (an
+# array from the 'array' module) instead of a list of separate Python
+# objects.  It has the same append/pop/len/[-1] behavior as a list, so
+# the stack functions above work with it unchanged, and it adds
+# push_many and pop_many to move many items with a single copy.
+class BufferStack:
+
+    def __init__(self, typecode="B", buffer=None):
+        # 'B' holds bytes (0-255).  If a 'buffer' (an array, or a bytearray
+        # for 'B') is given, the stack uses it as it is, without a copy.
+        self.typecode = typecode
+        self.items = array(typecode) if buffer is None else buffer
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def append(self, item):
+        self.items.append(item)
+
+    def pop(self):
+        return self.items.pop()
+
+    def push_many(self, items):
+        # Push every item at once.  Bytes-like objects are copied straight
+        # into the buffer (as raw items of the stack's typecode).
+        if isinstance(items, (bytes, bytearray, memoryview, array)):
+            if isinstance(self.items, bytearray):
+                self.items += items
+            else:
+                self.items.frombytes(items)
+        else:
+            self.items.extend(items)
+
+    def pop_many(self, count):
+        # Pop the top 'count' items and return them as an array in the
+        # order they come off the stack (the last one pushed comes first).
+        if count >= len(self.items):
+            # Popping everything: hand over the whole buffer, no copy needed
+            popped = self.items
+            self.items = popped[:0] # An empty buffer of the same kind
+        else:
+            popped = self.items[len(self.items) - count:]
+            del self.items[len(self.items) - count:]
+        popped.reverse()
+        return popped
+
 # A stack based function to reverse a string
 def reverse(string):
-    n = len(string)
-     
-    # Create a empty stack
-    stack = createStack()
- 
-    # Push all characters of string to stack
-    for i in range(0,n,1):
-        push(stack,string[i])
- 
-    # Making the string empty since all
-    #characters are saved in stack
-    string=""
- 
-    # Pop all characters of string and
-    # put them back to string
-    for i in range(0,n,1):
-        string+=pop(stack)
-         
-    return string
+    # Encode the text straight into a bytearray, which the stack then uses
+    # as its buffer, so the text is copied once on the way in and once on
+    # the way out.  Text that fits in one byte per character is encoded
+    # as Latin-1.  Other text is encoded as 4-byte code points (UTF-32,
+    # little-endian): reversing those bytes reverses the characters and
+    # turns each one big-endian, so it is decoded as UTF-32 big-endian.
+    try:
+        buffer = bytearray(string, "latin-1")
+        encoding = "latin-1"
+    except UnicodeEncodeError:
+        buffer = bytearray(string, "utf-32-le", "surrogatepass")
+        encoding = "utf-32-be"
+    stack = BufferStack("B", buffer)
+
+    # Pop all characters (they come off in reverse order, reversed in
+    # place) and turn them back into a string
+    popped = stack.pop_many(len(stack))
+    return popped.decode(encoding, "surrogatepass")
+
+# A function to reverse the bytes of a large buffer (such as bytes or an
+# mmap) and write them to 'out' (a file opened in binary mode).  Only
+# 'chunk_size' bytes are on the stack at a time: chunks are taken from
+# the end of the buffer, pushed, and popped back off reversed.
+def reverse_chunks(buffer, out, chunk_size=1 << 20):
+    view = memoryview(buffer).cast("B")
+    stack = BufferStack("B")
+    end = len(view)
+    while end > 0:
+        start = max(0, end - chunk_size)
+        stack.push_many(view[start:end])
+        out.write(stack.pop_many(len(stack)))
+        end = start
+    view.release()
+
+# A function to reverse the bytes of the file at 'path' into 'out'.  The
+# file is memory-mapped, so only the chunk being reversed is read in.
+# Multi-byte UTF-8 characters are reversed byte by byte, so this is
+# meant for bytes and ASCII text such as log lines.
+def reverse_file(path, out, chunk_size=1 << 20):
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as region:
+            reverse_chunks(region, out, chunk_size)
      
-################################
-#TEST 1
-################################
-string = "1 2 3 4 5 6 7"
-string = reverse(string)
-print("\nTest 1: Reversed string is " + string)
-# Expected result: "Test 1: Reversed string is 7 6 5 4 3 2 1"
-
-################################
-#TEST 2
-################################
-string="wow mom civic racecar minim level radar rotator rotavator reverse"
-string = reverse(string)
-print("\nTest 2: Reversed string is " + string)
-# Expected result:"Test 2: Reversed string is esrever rotavator rotator radar level minim racecar civic mom wow"
-
-################################
-#TEST 3
-################################
-string = "1 @ tenet & 3 + 4 = 7"
-string = reverse(string)
-print("\nTest 3: Reversed string is " + string)
-# Expected result: "Test 3: Reversed string is 7 = 4 + 3 & tenet @ 1"
 
 """
 Practice Exercise: The Hi Lo Game. 
@@ -115,113 +171,179 @@ The program should do the following:
 9) Create conditions that compare the selected cards shown and direct what should happen as a result of the comparison.
 
 """
-def hi_lo_game(string):
-   n = len(string)
-
-   # Create an empty stack for player1
-   p1 = createStack()
-
-   # Push all characters of string to stack for player1
-   for i in range(0,n,1):
-      push(p1,string[i])
-
-   # Reverse the string for player2
-   string2 = reverse(string)
-
-   # Create an empty stack for player2
-   p2 = createStack()
-
-   # Push all characters of string to stack for player2
-   for i in range(0,n,1):
-      push(p2,string2[i])
-
-   # Start the game loop
+# Codes for who won a round or a game
+TIE = 0
+PLAYER1 = 1
+PLAYER2 = 2
+
+# The events produced by play_hi_lo.  A Round holds the two cards shown,
+# who won the round and how many cards each player has left afterwards.
+# GameOver holds the winner and the number of rounds played.
+Round = namedtuple("Round", "number p1_card p2_card winner p1_cards p2_cards")
+GameOver = namedtuple("GameOver", "winner rounds")
+
+# Player strategies.  A strategy is given the hand (a list of cards) and
+# returns the player's stack, arranged so that the card on top (the back
+# of the stack) is the one the player will show first.
+
+# Select cards from the top of the stack (Player1 in the exercise)
+def top_of_stack(cards):
+   stack = createStack()
+   for card in cards:
+      push(stack, card)
+   return stack
+
+# Select cards from the bottom of the stack (Player2 in the exercise)
+def bottom_of_stack(cards):
+   stack = createStack()
+   for card in reversed(cards):
+      push(stack, card)
+   return stack
+
+# Always show the highest card left
+def highest_first(cards):
+   return top_of_stack(sorted(cards))
+
+# Always show the lowest card left
+def lowest_first(cards):
+   return top_of_stack(sorted(cards, reverse=True))
+
+# The game itself, as a generator.  It yields a Round event for every
+# round and a GameOver event at the end, and does no printing, so it can
+# be used by any program.  The players' stacks come from their strategies.
+def play_hi_lo(string, p1_strategy=top_of_stack, p2_strategy=bottom_of_stack):
+   cards = [int(card) for card in string]
+   yield from play_stacks(p1_strategy(cards), p2_strategy(cards))
+
+# Play the game with two stacks that are already arranged.  The stacks
+# are used up as the game is played.
+def play_stacks(p1, p2):
+   rounds = 0
    while True:
-      # Assign a variable to the function to select a card for Player1.
+      # Each player shows the card on the top of their stack.
       p1_card = peek_stack(p1)
-
-      # Assign a variable to the function to select a card for Player2.
       p2_card = peek_stack(p2)
 
-      # Check length of stacks and provide conditions for ending the game.
-      # Both players ran out of cards on the previous turn.
-      if p1_card == None and p2_card == None:
-         print("\nGame Over! Tie game.")
+      # The game ends when a player has no cards left.
+      if p1_card is None and p2_card is None:
+         yield GameOver(TIE, rounds)
          return
-      # Player1 runs out of cards, Player2 still has cards
-      elif len(p1) == 0:
-         if len(p2) > 0:
-            print("\nGame Over! Player 2 wins.")
-            return
-      # Player2 runs out of cards, Player1 still has cards
-      elif len(p2) == 0:
-         if len(p1) > 0:
-            print("\nGame Over! Player 1 wins.")
-            return
-      # Both players select the same card
-      elif p1_card == p2_card:
-         print(p1_card, p2_card)
-         print("Round is a tie.")
+      if p1_card is None:
+         yield GameOver(PLAYER2, rounds)
+         return
+      if p2_card is None:
+         yield GameOver(PLAYER1, rounds)
+         return
+
+      # Otherwise the lower card is discarded (both cards on a tie).
+      rounds += 1
+      if p1_card == p2_card:
+         winner = TIE
          pop(p1)
          pop(p2)
-      # Player1 selects card with higher value   
       elif p1_card > p2_card:
-         print(p1_card, p2_card)
-         print("Round goes to Player 1.")
+         winner = PLAYER1
          pop(p2)
-      # Player2 selects card with higher value  
-      elif p2_card > p1_card: 
-         print(p1_card, p2_card)
-         print("Round goes to Player 2.")
+      else:
+         winner = PLAYER2
          pop(p1)
-      
-   
-
-################################
-#TEST 1
-################################
-print("\nTest 1 Game Results:")
-string = "1234567"
-test1 = hi_lo_game(string)
-# Expected result: "Game Over! Player 1 wins."
-
-################################
-#TEST 2
-################################
-print("\nTest 2 Game Results:")
-string = "9876543"
-test2 = hi_lo_game(string)
-# Expected result: "Game Over! Player 2 wins."
-
-################################
-#TEST 3
-################################
-print("\nTest 3 Game Results:")
-string = "3275137"
-test3 = hi_lo_game(string)
-# Expected result: "Game Over! Player 1 wins."
-
-################################
-#TEST 4
-################################
-print("\nTest 4 Game Results:")
-string = "1234321"
-test4 = hi_lo_game(string)
-# Expected result: Game Over! Tie game.
-
-################################
-#TEST 5
-################################
-print("\nTest 5 Game Results:")
-string = "9886549"
-test5 = hi_lo_game(string)
-# Expected result: Game Over! Tie game.
-
-
-
-
-
-
-
-
-
+      yield Round(rounds, p1_card, p2_card, winner, size(p1), size(p2))
+
+ROUND_MESSAGES = {
+   TIE: "Round is a tie.",
+   PLAYER1: "Round goes to Player 1.",
+   PLAYER2: "Round goes to Player 2.",
+}
+GAME_OVER_MESSAGES = {
+   TIE: "\nGame Over! Tie game.",
+   PLAYER1: "\nGame Over! Player 1 wins.",
+   PLAYER2: "\nGame Over! Player 2 wins.",
+}
+
+# Play one game and print each round and the result.  The winner
+# (TIE, PLAYER1 or PLAYER2) is returned.
+def hi_lo_game(string):
+   for event in play_hi_lo(string):
+      if isinstance(event, GameOver):
+         print(GAME_OVER_MESSAGES[event.winner])
+         return event.winner
+      print(event.p1_card, event.p2_card)
+      print(ROUND_MESSAGES[event.winner])
+
+
+def main():
+   ################################
+   #TEST 1
+   ################################
+   string = "1 2 3 4 5 6 7"
+   string = reverse(string)
+   print("\nTest 1: Reversed string is " + string)
+   # Expected result: "Test 1: Reversed string is 7 6 5 4 3 2 1"
+
+   ################################
+   #TEST 2
+   ################################
+   string="wow mom civic racecar minim level radar rotator rotavator reverse"
+   string = reverse(string)
+   print("\nTest 2: Reversed string is " + string)
+   # Expected result:"Test 2: Reversed string is esrever rotavator rotator radar level minim racecar civic mom wow"
+
+   ################################
+   #TEST 3
+   ################################
+   string = "1 @ tenet & 3 + 4 = 7"
+   string = reverse(string)
+   print("\nTest 3: Reversed string is " + string)
+   # Expected result: "Test 3: Reversed string is 7 = 4 + 3 & tenet @ 1"
+
+   ################################
+   #TEST 4
+   ################################
+   out = io.BytesIO()
+   reverse_chunks(b"line one\nline two\n", out, chunk_size=4)
+   print("\nTest 4: Reversed bytes are " + repr(out.getvalue()))
+   # Expected result: "Test 4: Reversed bytes are b'\nowt enil\neno enil'"
+
+   ################################
+   #TEST 1
+   ################################
+   print("\nTest 1 Game Results:")
+   string = "1234567"
+   test1 = hi_lo_game(string)
+   # Expected result: "Game Over! Player 1 wins."
+
+   ################################
+   #TEST 2
+   ################################
+   print("\nTest 2 Game Results:")
+   string = "9876543"
+   test2 = hi_lo_game(string)
+   # Expected result: "Game Over! Player 2 wins."
+
+   ################################
+   #TEST 3
+   ################################
+   print("\nTest 3 Game Results:")
+   string = "3275137"
+   test3 = hi_lo_game(string)
+   # Expected result: "Game Over! Player 1 wins."
+
+   ################################
+   #TEST 4
+   ################################
+   print("\nTest 4 Game Results:")
+   string = "1234321"
+   test4 = hi_lo_game(string)
+   # Expected result: Game Over! Tie game.
+
+   ################################
+   #TEST 5
+   ################################
+   print("\nTest 5 Game Results:")
+   string = "9886549"
+   test5 = hi_lo_game(string)
+   # Expected result: Game Over! Tie game.
+
+
+if __name__ == "__main__":
+   main()
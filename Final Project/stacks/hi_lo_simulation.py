@@ -0,0 +1,109 @@
+# A batch (Monte Carlo) simulator for the Hi Lo Game
+
+"""
+hi_lo_game plays one hand at a time and prints every round, which is far
+too slow to learn how the two strategies (Player1 plays from the top of
+the stack, Player2 from the bottom) do over millions of random hands.
+
+This simulator deals many 7-card hands at once from the 36-card deck
+(four of each number from 1 to 9) and plays all of them together with
+NumPy.  Each hand is a row of a 2-D array.  Because both players start
+with the same cards, each player's stack is just a position in that row:
+
+    Player1's top card is at position 'top'    (starting at 6, moving left)
+    Player2's top card is at position 'bottom' (starting at 0, moving right)
+
+Every round compares the two cards in every row at once.  The lower card
+is discarded by moving that player's position (both move on a tie), which
+is the same as popping it from the stack.  A player whose position runs
+off the end of the row is out of cards.  A game can last at most 13
+rounds, so the loop runs at most 13 times no matter how many hands there
+are.
+
+NumPy is only needed by this module.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+
+HAND_SIZE = 7
+DECK = np.repeat(np.arange(1, 10, dtype=np.int8), 4) # 36 cards
+MAX_ROUNDS = 2 * HAND_SIZE - 1
+
+# The winner codes used in the arrays returned below
+TIE = 0
+PLAYER1 = 1
+PLAYER2 = 2
+
+# 'winners' counts [ties, Player1 wins, Player2 wins].
+# 'rounds' counts how many games lasted 0, 1, ... MAX_ROUNDS rounds.
+SimulationResult = namedtuple("SimulationResult", "hands winners rounds")
+
+
+def deal_hands(count, rng):
+    # Return a (count, 7) array of hands dealt from a shuffled deck
+    decks = rng.permuted(np.tile(DECK, (count, 1)), axis=1)
+    return decks[:, :HAND_SIZE]
+
+
+def play_hands(hands):
+    """
+    Play every hand (a row of the 2-D array 'hands') and return two
+    arrays: the winner code of each hand (TIE, PLAYER1 or PLAYER2) and
+    the number of rounds each hand took.
+    """
+    hands = np.asarray(hands)
+    count, size = hands.shape
+    rows = np.arange(count)
+    top = np.full(count, size - 1, dtype=np.intp)  # Player1's top card
+    bottom = np.zeros(count, dtype=np.intp)        # Player2's top card
+    rounds = np.zeros(count, dtype=np.intp)
+
+    for _ in range(2 * size - 1):
+        playing = (top >= 0) & (bottom < size)
+        if not playing.any():
+            break
+        p1_card = hands[rows, np.maximum(top, 0)]
+        p2_card = hands[rows, np.minimum(bottom, size - 1)]
+        # The lower card (or both cards on a tie) is discarded
+        top -= playing & (p1_card <= p2_card)
+        bottom += playing & (p1_card >= p2_card)
+        rounds += playing
+
+    p1_out = top < 0
+    p2_out = bottom >= size
+    winners = np.where(p1_out & p2_out, TIE, np.where(p1_out, PLAYER2, PLAYER1))
+    return winners, rounds
+
+
+def simulate(count, seed=None, batch_size=1_000_000):
+    """
+    Deal and play 'count' random hands and return a SimulationResult
+    with the winner counts and the distribution of game lengths.  The
+    hands are played 'batch_size' at a time to limit memory.  The same
+    'seed' always gives the same result.
+    """
+    rng = np.random.default_rng(seed)
+    winners = np.zeros(3, dtype=np.int64)
+    rounds = np.zeros(MAX_ROUNDS + 1, dtype=np.int64)
+    remaining = count
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        batch_winners, batch_rounds = play_hands(deal_hands(batch, rng))
+        winners += np.bincount(batch_winners, minlength=3)
+        rounds += np.bincount(batch_rounds, minlength=MAX_ROUNDS + 1)
+        remaining -= batch
+    return SimulationResult(count, winners, rounds)
+
+
+def main():
+    # Test cases: the same five hands as the tests in hi_lo_game.py
+    test_winners, test_rounds = play_hands(
+        [[int(card) for card in hand] for hand in ["1234567", "9876543", "3275137", "1234321", "9886549"]])
+    print(test_winners) # [1 2 1 0 0]
+    print(list(simulate(1000, seed=212).winners) == list(simulate(1000, seed=212).winners)) # True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# An exhaustive outcome table for the Hi Lo Game
+
+"""
+There are only 9^7 = 4,782,969 ways to lay out a 7-card hand using the
+numbers 1 to 9, so instead of playing a hand every time its result is
+needed, every hand can be played once and the results saved in a table.
+
+1) outcome(hand) plays a hand without printing anything.  The game is
+   written recursively on the two remaining stacks, and the results for
+   those (Player1's cards, Player2's cards) pairs are memoized with a
+   small functools.lru_cache, so the endings that nearby hands share
+   are only worked out once.  (Only about 1 in 9 lookups is a hit, so a
+   bigger cache just uses more memory in every worker.)
+2) solve() plays every hand.  The hands are split into 81 chunks by
+   their first two cards and the chunks are played in parallel with a
+   ProcessPoolExecutor.
+3) The result is one byte per hand, stored at the hand's position in
+   base 9 (card 1 is digit 0, card 9 is digit 8), so looking up a hand
+   is O(1).  save_table writes it to a file and HiLoTable reads it back
+   with mmap.
+
+Each byte holds the winner (TIE, PLAYER1 or PLAYER2) in its low two bits
+and the number of rounds in the rest.  Hands that need five or more of
+the same number cannot be dealt from the deck (there are only four of
+each), and are stored as INVALID.
+
+To build the table file, run this from this folder:
+
+    python hi_lo_solver.py
+
+or this from the Final Project folder:
+
+    python -m cse212 solve
+
+"""
+import itertools
+import mmap
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+
+HAND_SIZE = 7
+CARDS = range(1, 10)
+TABLE_SIZE = 9 ** HAND_SIZE
+
+# The winner codes (the same as in hi_lo_simulation.py)
+TIE = 0
+PLAYER1 = 1
+PLAYER2 = 2
+INVALID = 0xFF
+
+# The table file is a header (magic number, version, number of hands)
+# followed by one byte per hand.
+_HEADER = struct.Struct("<4sBxxxQ")
+_MAGIC = b"HILO"
+_VERSION = 1
+_PREFIX_CARDS = 2 # The chunks solved in parallel share their first 2 cards
+
+
+@lru_cache(maxsize=1 << 14)
+def _play(p1, p2):
+    """
+    Return (winner, rounds) for the game where Player1 holds the tuple of
+    cards 'p1' (top card last) and Player2 holds 'p2' (top card first).
+    The lower card is discarded (both on a tie) and the game continues
+    with the smaller stacks.
+    """
+    if not p1:
+        return (TIE if not p2 else PLAYER2), 0
+    if not p2:
+        return PLAYER1, 0
+    p1_card = p1[-1]
+    p2_card = p2[0]
+    if p1_card == p2_card:
+        winner, rounds = _play(p1[:-1], p2[1:])
+    elif p1_card > p2_card:
+        winner, rounds = _play(p1, p2[1:])
+    else:
+        winner, rounds = _play(p1[:-1], p2)
+    return winner, rounds + 1
+
+
+def outcome(hand):
+    # Play 'hand' (a string like "3275137" or a sequence of ints) and
+    # return (winner, rounds).  Both players start with the same cards.
+    cards = tuple(int(card) for card in hand)
+    return _play(cards, cards)
+
+
+def hand_index(hand):
+    # The position of 'hand' in the table (the hand read in base 9).
+    # A ValueError is raised for a card that is not between 1 and 9.
+    index = 0
+    for card in hand:
+        card = int(card)
+        if not 1 <= card <= 9:
+            raise ValueError(f"{card} is not a card (cards are 1 to 9)")
+        index = index * 9 + card - 1
+    return index
+
+
+def _is_valid(hand):
+    # A 7-card hand is invalid if some number appears 5 or more times.
+    # Such a number must appear in the first 3 cards (only 2 other cards
+    # are left over), so only those need to be counted.
+    return hand.count(hand[0]) <= 4 and hand.count(hand[1]) <= 4 and hand.count(hand[2]) <= 4
+
+
+def _solve_chunk(prefix):
+    """
+    Play every hand that starts with the cards in 'prefix' and return
+    their table bytes in index order.  This runs in a worker process.
+    """
+    chunk = bytearray()
+    for rest in itertools.product(CARDS, repeat=HAND_SIZE - len(prefix)):
+        hand = prefix + rest
+        if _is_valid(hand):
+            winner, rounds = _play(hand, hand)
+            chunk.append(winner | rounds << 2)
+        else:
+            chunk.append(INVALID)
+    # The next chunk shares none of these hands, so free the memory
+    _play.cache_clear()
+    return bytes(chunk)
+
+
+def solve(workers=None):
+    """
+    Play every possible hand and return the whole table as a bytearray
+    (one byte per hand).  'workers' is the number of processes to use
+    (None uses one per CPU).
+    """
+    prefixes = list(itertools.product(CARDS, repeat=_PREFIX_CARDS))
+    table = bytearray()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map returns the chunks in the same order as the prefixes
+        for chunk in pool.map(_solve_chunk, prefixes, chunksize=4):
+            table += chunk
+    return table
+
+
+def save_table(table, path):
+    # Write the table to the file at 'path'
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(table)))
+        file.write(table)
+
+
+class HiLoTable:
+    """
+    The outcome table read from a file written by save_table.  The file
+    is memory-mapped, so opening it is instant and every lookup reads
+    just one byte.  Use it in a 'with' statement (or call close()).
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            self.file.close()
+            raise ValueError(f"{path} is not a Hi Lo table") from None
+
+        # The header must be followed by one byte for every hand
+        if len(self.map) < _HEADER.size + TABLE_SIZE:
+            self.close()
+            raise ValueError(f"{path} is not a Hi Lo table")
+        magic, version, count = _HEADER.unpack_from(self.map)
+        if magic != _MAGIC or version != _VERSION or count != TABLE_SIZE:
+            self.close()
+            raise ValueError(f"{path} is not a Hi Lo table")
+
+    def lookup(self, hand):
+        # Return (winner, rounds) for 'hand'.  A ValueError is raised for
+        # a hand that cannot be dealt from the deck.
+        if len(hand) != HAND_SIZE:
+            raise ValueError("a hand has 7 cards")
+        value = self.map[_HEADER.size + hand_index(hand)]
+        if value == INVALID:
+            raise ValueError(f"{hand} needs more than four of one number")
+        return value & 3, value >> 2
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def build_table(path="hi_lo_table.bin", workers=None):
+    # Solve every hand, save the table to 'path' and check one lookup
+    start = time.perf_counter()
+    table = solve(workers)
+    save_table(table, path)
+    print(f"Solved {len(table):,} hands in {time.perf_counter() - start:.1f}s")
+    with HiLoTable(path) as saved:
+        print(saved.lookup("3275137")) # (1, 9)
+
+
+def main():
+    # The same five hands as the tests in hi_lo_game.py
+    print([outcome(hand)[0] for hand in ["1234567", "9876543", "3275137", "1234321", "9886549"]]) # [1, 2, 1, 0, 0]
+    print(hand_index("1111111"), hand_index("9999999")) # 0 4782968
+    try:
+        hand_index("1111110")
+    except ValueError as error:
+        print(error) # 0 is not a card (cards are 1 to 9)
+    print(_solve_chunk((9, 9, 9, 9, 9, 9))[-1]) # 255 .. seven 9s is not a valid hand
+
+
+if __name__ == "__main__":
+    main()
+    build_table()
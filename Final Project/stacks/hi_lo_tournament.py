@@ -0,0 +1,132 @@
+# An asyncio tournament runner for the Hi Lo Game
+
+"""
+A tournament plays many hands between many players.  Each player is a
+strategy from hi_lo_game.py (or any function with the same shape): it is
+given the hand and returns the player's stack.  A strategy can also be an
+async function, for example one that asks a remote player how to arrange
+their cards.
+
+run_tournament plays every hand with every ordered pair of players (each
+player gets a turn as Player1 and as Player2).  Up to 'concurrency'
+matches are in progress at once, and each match gives the others a turn
+after every round.  Results are streamed back as they finish, so a caller
+can start counting before the whole tournament is done:
+
+    async for result in run_tournament(hands, players):
+        ...
+
+"""
+import asyncio
+import inspect
+from collections import Counter, namedtuple
+
+if __package__:
+    from .hi_lo_game import (PLAYER1, PLAYER2, GameOver, bottom_of_stack,
+                             highest_first, lowest_first, play_stacks,
+                             top_of_stack)
+else:
+    from hi_lo_game import (PLAYER1, PLAYER2, GameOver, bottom_of_stack,
+                            highest_first, lowest_first, play_stacks,
+                            top_of_stack)
+
+
+MatchResult = namedtuple("MatchResult", "hand player1 player2 winner rounds")
+
+
+async def arrange(strategy, cards):
+    # Call a strategy that may be a normal function or an async function
+    stack = strategy(cards)
+    if inspect.isawaitable(stack):
+        stack = await stack
+    return stack
+
+
+async def play_match(hand, player1, player2, players):
+    # Play one hand between the players named 'player1' and 'player2'
+    cards = [int(card) for card in hand]
+    p1 = await arrange(players[player1], cards)
+    p2 = await arrange(players[player2], cards)
+    for event in play_stacks(p1, p2):
+        if isinstance(event, GameOver):
+            return MatchResult(hand, player1, player2, event.winner, event.rounds)
+        await asyncio.sleep(0) # Let the other matches have a turn
+
+
+async def run_tournament(hands, players, concurrency=64):
+    """
+    Play every hand in 'hands' between every ordered pair of players in
+    the dictionary 'players' (name -> strategy) and yield a MatchResult
+    for each match as soon as it finishes.  'concurrency' worker tasks
+    take matches from a shared list of matches, so only that many
+    matches (and results waiting to be read) are held at once.  If a
+    strategy raises an error, the tournament stops and the error is
+    raised from the loop.
+    """
+    matches = ((hand, player1, player2)
+               for hand in hands
+               for player1 in players
+               for player2 in players
+               if player1 != player2)
+    results = asyncio.Queue(maxsize=concurrency)
+
+    async def worker():
+        # Taking the next match does not await, so workers never share one
+        for hand, player1, player2 in matches:
+            await results.put(await play_match(hand, player1, player2, players))
+
+    async def run_workers():
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # If one worker fails (or we are cancelled), stop the others
+            for task in workers:
+                task.cancel()
+
+    runner = asyncio.create_task(run_workers())
+    try:
+        # Wait for the next result or for the workers to finish, until
+        # the workers are done and every result has been handed out
+        while not (runner.done() and results.empty()):
+            getter = asyncio.ensure_future(results.get())
+            done, _ = await asyncio.wait({getter, runner},
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+            else:
+                getter.cancel()
+        await runner # Raise any error from a worker
+    finally:
+        runner.cancel()
+
+
+async def standings(hands, players, concurrency=64):
+    # Run a tournament and return a Counter of wins for each player
+    wins = Counter()
+    async for result in run_tournament(hands, players, concurrency):
+        if result.winner == PLAYER1:
+            wins[result.player1] += 1
+        elif result.winner == PLAYER2:
+            wins[result.player2] += 1
+    return wins
+
+
+def main():
+    # Test cases for the tournament
+    test_players = {"top": top_of_stack, "bottom": bottom_of_stack}
+    test_hands = ["1234567", "9876543", "3275137", "1234321", "9886549"]
+    test_results = asyncio.run(standings(test_hands, test_players))
+    print(test_results["top"], test_results["bottom"]) # 4 2
+
+    async def slow_highest(cards):
+        await asyncio.sleep(0.001) # Pretend to ask a remote player
+        return highest_first(cards)
+
+    test_players = {"highest": slow_highest, "lowest": lowest_first}
+    test_results = asyncio.run(standings(test_hands, test_players))
+    print(test_results["highest"], test_results["lowest"]) # 10 0
+
+
+if __name__ == "__main__":
+    main()
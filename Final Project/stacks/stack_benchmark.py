@@ -0,0 +1,97 @@
+# Benchmarks for the stack functions in hi_lo_game.py
+
+"""
+This program will time reversing large strings with stacks.
+
+The list version pushes one character at a time onto a Python list and
+then builds the result with string += pop(stack), which makes a new
+string for every character.  The buffer version (the current reverse)
+pushes all of the characters into a BufferStack at once and pops them
+back off as one array.
+
+It also compares how many Hi Lo hands per second can be played one at
+a time with hi_lo_game (with its printing thrown away) and in batches
+with the NumPy simulator in hi_lo_simulation.py.
+
+Run it from this folder:
+
+    python stack_benchmark.py
+
+"""
+import contextlib
+import io
+import random
+import time
+
+if __package__:
+    from .hi_lo_game import createStack, hi_lo_game, pop, push, reverse, reverse_chunks
+else:
+    from hi_lo_game import createStack, hi_lo_game, pop, push, reverse, reverse_chunks
+
+
+def list_reverse(string):
+    # Reverse a string the original way: one push and one += per character
+    stack = createStack()
+    for i in range(len(string)):
+        push(stack, string[i])
+    string = ""
+    for i in range(len(stack)):
+        string += pop(stack)
+    return string
+
+
+def benchmark_reverse(sizes=(10_000, 100_000, 1_000_000, 10_000_000)):
+    print("\n=========== REVERSE: list stack vs BufferStack ===========")
+    print(f"{'characters':>12}{'list':>12}{'buffer':>12}{'chunked bytes':>16}")
+    for count in sizes:
+        text = ("log line " * (count // 9 + 1))[:count]
+
+        start = time.perf_counter()
+        list_reverse(text)
+        list_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reverse(text)
+        buffer_seconds = time.perf_counter() - start
+
+        data = text.encode()
+        start = time.perf_counter()
+        reverse_chunks(data, io.BytesIO())
+        chunk_seconds = time.perf_counter() - start
+
+        print(f"{count:>12,}{list_seconds:>11.3f}s{buffer_seconds:>11.3f}s{chunk_seconds:>15.3f}s")
+
+
+def benchmark_hi_lo_hands(scalar_hands=20_000, batch_hands=1_000_000):
+    print("\n=========== HI LO HANDS: scalar loop vs batch simulator ===========")
+    deck = [str(number) for number in range(1, 10)] * 4
+    hands = ["".join(random.sample(deck, 7)) for _ in range(scalar_hands)]
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for hand in hands:
+            hi_lo_game(hand)
+    seconds = time.perf_counter() - start
+    print(f"hi_lo_game          {scalar_hands / seconds:>14,.0f} hands/s")
+
+    try:
+        if __package__:
+            from .hi_lo_simulation import simulate
+        else:
+            from hi_lo_simulation import simulate
+    except ImportError:
+        print("simulate skipped (NumPy is not installed)")
+        return
+    start = time.perf_counter()
+    simulate(batch_hands, seed=0)
+    seconds = time.perf_counter() - start
+    print(f"simulate            {batch_hands / seconds:>14,.0f} hands/s")
+
+
+def main():
+    benchmark_reverse()
+    benchmark_hi_lo_hands()
+
+
+if __name__ == "__main__":
+    main()